@@ -3,10 +3,13 @@ from .exceptions import NotNowException
 from .groups import (create_group, get_global_group, get_group, get_groups,
                      get_or_create_group, unregister_token)
 from .hooks import (define, get_all_hooks, get_all_registrations, get_hook, Hook, register, trigger,
-                    trigger_with_tags, mute_context, registered,
+                    trigger_with_tags, trigger_async, trigger_many, mute_context, registered, bulk_registration,
                    )
 from .blueprint import Blueprint
+from .coalesce import coalescing
+from .event_queue import post
 from .helpers import FIRST, DONT_CARE, LAST, Toggle
+from .stats import get_stats
 
 
 def set_exception_policy(policy):
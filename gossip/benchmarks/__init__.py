@@ -0,0 +1,114 @@
+"""Micro-benchmarks for gossip's hot paths.
+
+Run them with ``python -m gossip.benchmarks`` (see ``--help`` for JSON output and comparing against a baseline)
+"""
+import itertools
+import timeit
+from contextlib import contextmanager
+from time import perf_counter
+
+from .. import groups, hooks, registry
+
+_benchmarks = []
+
+_hook_id = itertools.count()
+
+# quick mode runs each measurement only a few times, for checking that the benchmarks work rather than measuring
+_quick = False
+
+
+def benchmark(func):
+    """Marks a function as a benchmark. Benchmarks return a dictionary of named measurements, where lower values are
+    better
+    """
+    _benchmarks.append(func)
+    return func
+
+
+def get_benchmarks():
+    return list(_benchmarks)
+
+
+def measure_ns(func, number=100000, repeat=5):
+    """Returns the best per-call time of ``func`` in nanoseconds
+    """
+    if _quick:
+        number, repeat = max(1, number // 1000), 1
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e9
+
+
+def get_sizes(sizes):
+    """Returns the problem sizes a scaling benchmark should measure -- only the smallest one in quick mode
+    """
+    return sizes[:1] if _quick else sizes
+
+
+def measure_ms(func, setup=None, repeat=3):
+    """Returns the best time of a single call of ``func`` in milliseconds, calling ``setup`` (untimed) before each call
+    """
+    if _quick:
+        repeat = 1
+    best = None
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = perf_counter()
+        func()
+        elapsed = perf_counter() - started
+        if best is None or elapsed < best:
+            best = elapsed
+    return best * 1000
+
+
+@contextmanager
+def temporary_hook(group_name='gossip_benchmarks', **kwargs):
+    """Defines a uniquely-named hook for the duration of a benchmark, and undefines it afterwards
+    """
+    hook = hooks.define('{0}.hook{1}'.format(group_name, next(_hook_id)), **kwargs)
+    try:
+        yield hook
+    finally:
+        hook.unregister_all()
+        if hook.full_name in registry.hooks:
+            hook.undefine()
+
+
+@contextmanager
+def temporary_group():
+    """Creates a uniquely-named group for the duration of a benchmark, undefining it (along with its hooks) afterwards
+    """
+    group = groups.create_group('gossip_benchmarks_group{0}'.format(next(_hook_id)))
+    try:
+        yield group
+    finally:
+        for hook in group.iter_hooks(recursive=True):
+            hook.unregister_all()
+        group.undefine()
+
+
+def run_benchmarks(names=None, quick=False):
+    """Runs the benchmarks (or only those named in ``names``), returning their measurements by benchmark name
+    """
+    global _quick  # pylint: disable=global-statement
+    _quick = quick
+    try:
+        return dict((func.__name__, func()) for func in _benchmarks if names is None or func.__name__ in names)
+    finally:
+        _quick = False
+
+
+def compare_to_baseline(results, baseline, threshold=0.1):
+    """Compares ``results`` to ``baseline`` (both as returned by :func:`run_benchmarks`), returning a list of
+    ``(benchmark_name, measurement_name, baseline_value, value, is_regression)`` for the measurements present in both.
+    A measurement regresses if it grew by more than ``threshold`` (a fraction of the baseline value)
+    """
+    returned = []
+    for benchmark_name, measurements in sorted(results.items()):
+        baseline_measurements = baseline.get(benchmark_name, {})
+        for measurement_name, value in sorted(measurements.items()):
+            baseline_value = baseline_measurements.get(measurement_name)
+            if baseline_value is None:
+                continue
+            returned.append((benchmark_name, measurement_name, baseline_value, value,
+                             value > baseline_value * (1 + threshold)))
+    return returned
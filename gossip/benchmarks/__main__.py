@@ -0,0 +1,62 @@
+import argparse
+import json
+import platform
+import sys
+
+from . import compare_to_baseline, get_benchmarks, run_benchmarks
+from . import memory, muting, ordering, registration, trigger  # pylint: disable=unused-import
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m gossip.benchmarks', description="Runs gossip's micro-benchmarks")
+    parser.add_argument('names', nargs='*', metavar='NAME',
+                        help='benchmarks to run (default: all of them): {0}'.format(
+                            ', '.join(func.__name__ for func in get_benchmarks())))
+    parser.add_argument('--json', metavar='PATH', help='write the results as JSON to PATH ("-" for standard output)')
+    parser.add_argument('--baseline', metavar='PATH', help='compare the results to a JSON file written by --json')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='fraction by which a measurement may exceed the baseline before it is considered a '
+                        'regression (default: %(default)s)')
+    parser.add_argument('--quick', action='store_true', help='run each measurement only a few times')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    known_names = set(func.__name__ for func in get_benchmarks())
+    unknown_names = sorted(set(args.names) - known_names)
+    if unknown_names:
+        print('Unknown benchmarks: {0}'.format(', '.join(unknown_names)), file=sys.stderr)
+        return 2
+    results = run_benchmarks(names=args.names or None, quick=args.quick)
+    # when writing JSON to standard output, the human-readable report goes to standard error
+    report_file = sys.stderr if args.json == '-' else sys.stdout
+    for benchmark_name, measurements in sorted(results.items()):
+        print(benchmark_name, file=report_file)
+        for measurement_name, value in sorted(measurements.items()):
+            print('    {0:<40} {1:>12.1f}'.format(measurement_name, value), file=report_file)
+
+    if args.json is not None:
+        output = {'python': platform.python_version(), 'quick': args.quick, 'results': results}
+        if args.json == '-':
+            json.dump(output, sys.stdout, indent=2, sort_keys=True)
+        else:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump(output, f, indent=2, sort_keys=True)
+
+    if args.baseline is None:
+        return 0
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)['results']
+    comparison = compare_to_baseline(results, baseline, args.threshold)
+    print('\nCompared to {0}:'.format(args.baseline), file=report_file)
+    for benchmark_name, measurement_name, baseline_value, value, is_regression in comparison:
+        print('    {0:<60} {1:>12.1f} -> {2:>12.1f} ({3:+.1%}){4}'.format(
+            '{0}.{1}'.format(benchmark_name, measurement_name), baseline_value, value,
+            value / baseline_value - 1 if baseline_value else 0.0, '  REGRESSION' if is_regression else ''),
+              file=report_file)
+    return 1 if any(is_regression for *_, is_regression in comparison) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""Memory benchmarks, measured with :mod:`tracemalloc`.
+
+For reference, on CPython 3.11 a plain registration took ~697 bytes and a tagged one ~915 bytes before registrations
+used ``__slots__`` and shared their tag and dependency sets; both now take ~218 bytes. Before shared sets were released
+along with the last registration using them, registering and unregistering handlers with distinct tags and needs
+retained ~619 bytes per handler, and now retains none
+"""
+import functools
+import gc
+import tracemalloc
+
+from ..hooks import bulk_registration
+from . import benchmark, temporary_hook
+
+_NUM_REGISTRATIONS = 10000
+
+
+def _handler():
+    pass
+
+
+def _register_many(hook, kwargs):
+    with bulk_registration():
+        for _ in range(_NUM_REGISTRATIONS):
+            hook.register(_handler, **kwargs)
+
+
+def _measure_bytes(func, setup=None):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        # setup runs while tracing, since freeing memory allocated before tracing started is not accounted for
+        if setup is not None:
+            setup()
+            gc.collect()
+        before = tracemalloc.get_traced_memory()[0]
+        func()
+        gc.collect()
+        return tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+
+@benchmark
+def registration_memory():
+    """Measures the memory taken by a registration (excluding the handler function itself), in bytes
+    """
+    returned = {}
+    for name, kwargs in [
+            ('plain', {}),
+            ('tagged', {'tags': ('a', 'b')}),
+            ('needs_provides', {'needs': ['x'], 'provides': ['y']}),
+    ]:
+        with temporary_hook() as hook:
+            returned['bytes_per_{0}_registration'.format(name)] = _measure_bytes(
+                functools.partial(_register_many, hook, kwargs)) / _NUM_REGISTRATIONS
+    return returned
+
+
+@benchmark
+def unregistered_registration_memory():
+    """Measures the memory retained after registering and unregistering handlers with distinct tags and needs, in
+    bytes per handler
+    """
+    with temporary_hook() as hook:
+
+        def register_and_unregister(first_index):
+            with bulk_registration():
+                for index in range(first_index, first_index + _NUM_REGISTRATIONS):
+                    hook.register(_handler, tags=['tag{0}'.format(index)], needs=['need{0}'.format(index)])
+            hook.unregister_all()
+
+        # the first round grows tables which are kept around for reuse, which is not what this measures
+        retained = _measure_bytes(lambda: register_and_unregister(_NUM_REGISTRATIONS),
+                                  setup=lambda: register_and_unregister(0))
+    return {'bytes_retained_per_handler': retained / _NUM_REGISTRATIONS}
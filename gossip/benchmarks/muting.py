@@ -0,0 +1,41 @@
+from ..muting import mute_context
+from . import benchmark, measure_ns, temporary_group, temporary_hook
+
+_NESTING_DEPTH = 10
+
+
+def _handler(**_):
+    pass
+
+
+def _enter_nested(hook_names, depth):
+    if depth:
+        with mute_context(hook_names):
+            _enter_nested(hook_names, depth - 1)
+
+
+@benchmark
+def muting():
+    """Measures entering and exiting :func:`gossip.mute_context` blocks, and triggering muted hooks
+    """
+    with temporary_group() as group:
+        with temporary_hook(group_name=group.name) as hook:
+            hook.register(_handler)
+            hook_names = [hook.full_name]
+            group_names = [group.name]
+
+            def trigger_muted_hook():
+                with mute_context(hook_names):
+                    hook.trigger({})
+
+            def trigger_in_muted_group():
+                with mute_context(groups=group_names):
+                    hook.trigger({})
+
+            return {
+                'mute_hook_ns': measure_ns(lambda: _enter_nested(hook_names, 1)),
+                'mute_hook_nested_{0}_ns'.format(_NESTING_DEPTH): measure_ns(
+                    lambda: _enter_nested(hook_names, _NESTING_DEPTH), number=10000),
+                'trigger_muted_hook_ns': measure_ns(trigger_muted_hook),
+                'trigger_in_muted_group_ns': measure_ns(trigger_in_muted_group),
+            }
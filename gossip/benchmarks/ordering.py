@@ -0,0 +1,39 @@
+import timeit
+
+from ..helpers import DONT_CARE
+from ..registration import _normalize_deps
+from ..utils import topological_sort_registrations
+from . import benchmark, get_sizes
+
+_SIZES = (10, 100, 1000, 10000)
+
+
+class _FakeRegistration():
+
+    def __init__(self, needs=None, provides=None):
+        super().__init__()
+        self.needs = _normalize_deps(needs)
+        self.provides = _normalize_deps(provides)
+
+
+def make_registrations(num_registrations):
+    """Creates registrations forming a binary tree of needs/provides, listed leaves-first so that sorting
+    has to reorder almost all of them
+    """
+    return [
+        _FakeRegistration(needs=['r{0}'.format((index - 1) // 2)] if index else None, provides=['r{0}'.format(index)])
+        for index in reversed(range(num_registrations))
+    ]
+
+
+@benchmark
+def topological_sort():
+    """Measures sorting registrations with needs/provides, in milliseconds
+    """
+    returned = {}
+    for num_registrations in get_sizes(_SIZES):
+        registrations = make_registrations(num_registrations)
+        elapsed = min(timeit.repeat(lambda: topological_sort_registrations(registrations, DONT_CARE),  # pylint: disable=cell-var-from-loop
+                                    number=1, repeat=3))
+        returned['sort_{0}_registrations_ms'.format(num_registrations)] = elapsed * 1000
+    return returned
@@ -0,0 +1,98 @@
+from .. import groups
+from ..blueprint import Blueprint
+from ..hooks import bulk_registration, register
+from . import benchmark, get_sizes, measure_ms, temporary_group, temporary_hook
+
+_SIZES = (100, 1000)
+
+_UNCONSTRAINED_SIZES = (1000, 50000)
+
+_NUM_HOOKS = 10
+
+_TOKEN = 'gossip_benchmarks_token'
+
+
+def _handler(**_):
+    pass
+
+
+def _register_chain(hook, num_registrations):
+    # each registration needs the one registered before it, so that all of them constrain the call order
+    for index in range(num_registrations):
+        hook.register(_handler, needs=['r{0}'.format(index - 1)] if index else None, provides=['r{0}'.format(index)])
+
+
+@benchmark
+def needs_provides_registration():
+    """Measures registering handlers depending on each other through needs/provides, one by one and within
+    :func:`gossip.bulk_registration`, in milliseconds
+    """
+    returned = {}
+    for num_registrations in get_sizes(_SIZES):
+
+        def register_one_by_one(num_registrations=num_registrations):
+            with temporary_hook() as hook:
+                _register_chain(hook, num_registrations)
+
+        def register_in_bulk(num_registrations=num_registrations):
+            with temporary_hook() as hook:
+                with bulk_registration():
+                    _register_chain(hook, num_registrations)
+
+        returned['register_{0}_ms'.format(num_registrations)] = measure_ms(register_one_by_one)
+        returned['bulk_register_{0}_ms'.format(num_registrations)] = measure_ms(register_in_bulk)
+    return returned
+
+
+@benchmark
+def unconstrained_registration():
+    """Measures registering handlers without needs/provides to a single hook, in milliseconds
+    """
+    returned = {}
+    for num_registrations in get_sizes(_UNCONSTRAINED_SIZES):
+
+        def register_all(num_registrations=num_registrations):
+            with temporary_hook() as hook:
+                for _ in range(num_registrations):
+                    hook.register(_handler)
+
+        returned['register_{0}_ms'.format(num_registrations)] = measure_ms(register_all)
+    return returned
+
+
+@benchmark
+def token_unregistration():
+    """Measures unregistering handlers (spread over several hooks) by token, in milliseconds
+    """
+    returned = {}
+    for num_registrations in get_sizes(_SIZES):
+        with temporary_group() as group:
+            hook_names = ['{0}.hook{1}'.format(group.name, index) for index in range(_NUM_HOOKS)]
+
+            def register_with_token(num_registrations=num_registrations, hook_names=hook_names):
+                with bulk_registration():
+                    for index in range(num_registrations):
+                        register(func=_handler, hook_name=hook_names[index % _NUM_HOOKS], token=_TOKEN)
+
+            returned['unregister_token_{0}_ms'.format(num_registrations)] = measure_ms(
+                lambda: groups.unregister_token(_TOKEN), setup=register_with_token)
+    return returned
+
+
+@benchmark
+def blueprint_install():
+    """Measures installing and uninstalling blueprints (spread over several hooks), in milliseconds
+    """
+    returned = {}
+    for num_registrations in get_sizes(_SIZES):
+        blueprint = Blueprint()
+        for index in range(num_registrations):
+            blueprint.register('hook{0}'.format(index % _NUM_HOOKS))(_handler)
+        with temporary_group() as group:
+
+            def install(blueprint=blueprint, group_name=group.name):
+                blueprint.install(group=group_name)
+
+            returned['install_{0}_ms'.format(num_registrations)] = measure_ms(install, setup=blueprint.uninstall)
+            returned['uninstall_{0}_ms'.format(num_registrations)] = measure_ms(blueprint.uninstall, setup=install)
+    return returned
@@ -0,0 +1,75 @@
+from .. import hooks
+from ..hooks import bulk_registration
+from . import benchmark, measure_ns, temporary_group, temporary_hook
+
+
+@benchmark
+def empty_trigger():
+    """Compares triggering a hook with no handlers to a plain dictionary lookup
+    """
+    with temporary_hook() as hook:
+        hook_name = hook.full_name
+        lookup_table = {hook_name: hook}
+        return {
+            'dict_lookup_ns': measure_ns(lambda: lookup_table.get(hook_name)),
+            'trigger_undefined_hook_ns': measure_ns(lambda: hooks.trigger('gossip_benchmarks.undefined_hook')),
+            'trigger_empty_hook_ns': measure_ns(lambda: hooks.trigger(hook_name)),
+            'hook_trigger_empty_hook_ns': measure_ns(lambda: hook.trigger({})),
+        }
+
+
+_HANDLER_COUNTS = (0, 1, 10, 1000)
+
+
+def _handler(**_):
+    pass
+
+
+@benchmark
+def trigger_by_handler_count():
+    """Measures triggering a hook with an increasing number of handlers
+    """
+    returned = {}
+    for num_handlers in _HANDLER_COUNTS:
+        with temporary_hook() as hook:
+            with bulk_registration():
+                for _ in range(num_handlers):
+                    hook.register(_handler)
+            hook_name = hook.full_name
+            returned['trigger_{0}_handlers_ns'.format(num_handlers)] = measure_ns(
+                lambda: hooks.trigger(hook_name),  # pylint: disable=cell-var-from-loop
+                number=max(100, 100000 // max(1, num_handlers)))
+    return returned
+
+
+@benchmark
+def tagged_trigger():
+    """Compares triggering a hook with tags (matching a fraction of its handlers) to triggering it without tags
+    """
+    with temporary_hook() as hook:
+        with bulk_registration():
+            for index in range(100):
+                hook.register(_handler, tags=('tag{0}'.format(index % 10),))
+            for _ in range(10):
+                hook.register(_handler)
+        tags = ('tag0', 'tag1')
+        return {
+            'trigger_without_tags_ns': measure_ns(lambda: hook.trigger({}), number=10000),
+            'trigger_with_tags_ns': measure_ns(lambda: hook.trigger({}, tags=tags), number=10000),
+        }
+
+
+@benchmark
+def strict_trigger():
+    """Measures the cost of validating arguments when triggering hooks of strict groups
+    """
+    arg_names = {'value': int, 'name': str}
+    kwargs = {'value': 1, 'name': 'x'}
+    returned = {}
+    for name, strict in [('non_strict', False), ('strict', True)]:
+        with temporary_group() as group:
+            group.set_strict(strict)
+            with temporary_hook(group_name=group.name, arg_names=arg_names) as hook:
+                hook.register(_handler)
+                returned['trigger_{0}_ns'.format(name)] = measure_ns(lambda: hook.trigger(kwargs))  # pylint: disable=cell-var-from-loop
+    return returned
@@ -29,10 +29,11 @@ class Blueprint():
         """Installs the blueprint, registering all of its handlers to their respective hooks
         """
         try:
-            for hook_name, func, kwargs in self._hooks:
-                if group is not None:
-                    hook_name = '{0}.{1}'.format(group, hook_name)
-                hooks.register(func=func, hook_name=hook_name, token=self._token, **kwargs)
+            with hooks.bulk_registration():
+                for hook_name, func, kwargs in self._hooks:
+                    if group is not None:
+                        hook_name = '{0}.{1}'.format(group, hook_name)
+                    hooks.register(func=func, hook_name=hook_name, token=self._token, **kwargs)
         except:
             self.uninstall()
             raise
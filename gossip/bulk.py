@@ -0,0 +1,67 @@
+"""Deferring the resolution of call order while registering many handlers, see :func:`gossip.bulk_registration`
+"""
+import itertools
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from . import registry
+from .exceptions import CannotResolveDependencies
+from .utils import is_sorted_by_priority
+
+_bulk_state = threading.local()
+
+
+def _get_bulk_registrations():
+    return getattr(_bulk_state, 'pending', None)
+
+
+@contextmanager
+def bulk_registration():
+    """A context manager deferring the handlers registered within it until it exits, at which point they are added
+    together and the call order of each touched hook is resolved once. This is useful when registering many handlers
+    at once, e.g. when loading plugins.
+
+    Until the block exits, triggers do not call the handlers registered within it. If the handlers of any hook cannot
+    be ordered on exit, none of the handlers registered within the block are added, and
+    :class:`gossip.exceptions.CannotResolveDependencies` is raised. If an exception propagates out of the block, the
+    handlers registered before it are added (unless they cannot be ordered). Nested blocks are resolved by the
+    outermost one. Only registrations made by the current thread are deferred
+    """
+    if _get_bulk_registrations() is not None:
+        yield
+        return
+    pending = _bulk_state.pending = OrderedDict()
+    try:
+        yield
+    except:
+        _bulk_state.pending = None
+        try:
+            _resolve_bulk_registrations(pending)
+        except CannotResolveDependencies:
+            pass  # the exception raised within the block takes precedence
+        raise
+    _bulk_state.pending = None
+    _resolve_bulk_registrations(pending)
+
+
+def _resolve_bulk_registrations(pending):
+    # pylint: disable=protected-access
+    with registry.lock:
+        # the new call orders are computed on copies first, so that nothing is added if any of them fails
+        call_orders = []
+        try:
+            for hook, registrations in pending.items():
+                # leaving out handlers unregistered within the block
+                registrations = [registration for registration in registrations if registration.hook is hook]
+                call_order = list(hook._registrations)
+                hook._insert_into_call_order(call_order, registrations)
+                call_orders.append((hook, registrations, call_order))
+        except CannotResolveDependencies:
+            for registration in itertools.chain.from_iterable(pending.values()):
+                registration.hook = None
+            raise
+        for hook, registrations, call_order in call_orders:
+            hook._registrations = call_order
+            hook._is_priority_sorted = is_sorted_by_priority(call_order)
+            hook._add_registrations(registrations)
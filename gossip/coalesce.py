@@ -0,0 +1,172 @@
+"""Merging repeated triggers of a hook into a single delivery, for hooks defined with ``coalesce`` or ``debounce_ms``
+"""
+import atexit
+import contextvars
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import logbook
+
+_logger = logbook.Logger(__name__)
+
+# the triggers deferred by the innermost active coalescing() block, or None outside of one
+_pending_triggers = contextvars.ContextVar('gossip_pending_triggers', default=None)
+# set while delivering coalesced triggers, so that they are not deferred again
+_delivering = contextvars.ContextVar('gossip_delivering_coalesced', default=False)
+
+_coalescers_with_pending = set()
+_coalescers_lock = threading.Lock()
+
+
+def merge_latest(pending_kwargs, new_kwargs):
+    """The default merge function, keeping the latest value passed for each argument
+    """
+    returned = dict(pending_kwargs)
+    returned.update(new_kwargs)
+    return returned
+
+
+class Coalescer():
+    """Defers the triggers of a hook, merging the arguments of repeated triggers using ``merge``, a function receiving
+    the pending keyword arguments and those of a new trigger and returning the merged ones
+
+    :param debounce_ms: if specified, triggers are delivered once no further trigger was made for this many milliseconds
+    """
+
+    def __init__(self, hook, merge=None, debounce_ms=None):
+        super().__init__()
+        if merge is not None and not callable(merge):
+            raise ValueError("Coalescing merge function must be callable (got: {0!r})".format(merge))
+        if debounce_ms is not None and debounce_ms <= 0:
+            raise ValueError("debounce_ms must be positive (got: {0!r})".format(debounce_ms))
+        self.hook = hook
+        self.merge = merge or merge_latest
+        self.debounce_ms = debounce_ms
+        self._lock = threading.Lock()
+        self._debounced = {}
+
+    def defer(self, kwargs, tags):
+        """Returns whether the trigger was deferred, or should be performed immediately
+        """
+        if _delivering.get():
+            return False
+        pending = _pending_triggers.get()
+        if pending is not None:
+            self.hook.validate_tags(tags)
+            self.hook.validate_kwargs(kwargs)
+            key = (self, _get_tags_key(tags))
+            entry = pending.get(key)
+            if entry is None:
+                pending[key] = [kwargs, tags, contextvars.copy_context()]
+            else:
+                entry[0] = self.merge(entry[0], kwargs)
+                entry[2] = contextvars.copy_context()
+            return True
+        if self.debounce_ms is None:
+            return False
+        self.hook.validate_tags(tags)
+        self.hook.validate_kwargs(kwargs)
+        self._debounce(kwargs, tags)
+        return True
+
+    def deliver(self, kwargs, tags):
+        token = _delivering.set(True)
+        try:
+            self.hook.trigger(kwargs, tags)
+        finally:
+            _delivering.reset(token)
+
+    def flush(self):
+        """Delivers the pending debounced triggers immediately
+        """
+        with self._lock:
+            entries = list(self._debounced.values())
+            self._debounced.clear()
+        self._discard_if_idle()
+        for kwargs, tags, context, _ in entries:
+            context.run(self.deliver, kwargs, tags)
+
+    def _debounce(self, kwargs, tags):
+        key = _get_tags_key(tags)
+        deadline = time.monotonic() + self.debounce_ms / 1000.0
+        with self._lock:
+            entry = self._debounced.get(key)
+            if entry is not None:
+                entry[0] = self.merge(entry[0], kwargs)
+                entry[2] = contextvars.copy_context()
+                entry[3] = deadline
+                return
+            self._debounced[key] = [kwargs, tags, contextvars.copy_context(), deadline]
+        with _coalescers_lock:
+            _coalescers_with_pending.add(self)
+        threading.Thread(target=self._deliver_when_idle, args=(key,), name='gossip-debounce', daemon=True).start()
+
+    def _deliver_when_idle(self, key):
+        while True:
+            with self._lock:
+                entry = self._debounced.get(key)
+                if entry is None:  # flushed meanwhile
+                    return
+                remaining = entry[3] - time.monotonic()
+                if remaining <= 0:
+                    del self._debounced[key]
+                    break
+            time.sleep(remaining)
+        self._discard_if_idle()
+        kwargs, tags, context, _ = entry
+        try:
+            context.run(self.deliver, kwargs, tags)
+        except Exception:  # pylint: disable=broad-except
+            _logger.error("Exception raised while delivering debounced trigger of {0}", self.hook.full_name,
+                          exc_info=True)
+
+    def _discard_if_idle(self):
+        with _coalescers_lock:
+            if not self._debounced:
+                _coalescers_with_pending.discard(self)
+
+
+def _get_tags_key(tags):
+    return None if tags is None else frozenset(tags)
+
+
+@contextmanager
+def coalescing():
+    """A context manager deferring the triggers of coalescing hooks (hooks defined with ``coalesce``) made within it in
+    the current context. Repeated triggers of the same hook (with the same tags) are merged, and each hook is triggered
+    once when the outermost block exits, in the order of their first triggers, within the context (e.g. muting) of
+    their latest trigger. Triggers made while the hook is muted are dropped rather than deferred. If delivering raises,
+    the remaining triggers are still delivered, and the first exception is raised afterwards
+    """
+    if _pending_triggers.get() is not None:
+        yield
+        return
+    pending = OrderedDict()
+    token = _pending_triggers.set(pending)
+    try:
+        yield
+    finally:
+        _pending_triggers.reset(token)
+        first_exception = None
+        for (coalescer, _), (kwargs, tags, context) in pending.items():
+            try:
+                context.run(coalescer.deliver, kwargs, tags)
+            except Exception as e:  # pylint: disable=broad-except
+                if first_exception is None:
+                    first_exception = e
+        if first_exception is not None:
+            raise first_exception
+
+
+def flush():
+    """Delivers all pending debounced triggers immediately
+    """
+    with _coalescers_lock:
+        coalescers = list(_coalescers_with_pending)
+    for coalescer in coalescers:
+        coalescer.flush()
+
+
+atexit.register(flush)
@@ -0,0 +1,87 @@
+from .helpers import DONT_CARE
+from .registration import PROCESS_EXECUTOR
+from .utils import get_dependency_levels
+
+_MAX_CACHED_TAG_SETS = 256
+
+
+class DispatchPlan():
+    """An immutable snapshot of a hook's call sequence, rebuilt only when the hook's registrations,
+    call order or callbacks change
+    """
+
+    __slots__ = ('registrations', 'pre_trigger_callbacks', 'post_trigger_callbacks', 'trigger_begin_callbacks',
+                 'trigger_end_callbacks', 'is_observed', 'executor', 'has_process_handlers', 'has_batch_handlers',
+                 'recorders', '_unconstrained_priority', '_tag_index', '_untagged_positions', '_registrations_by_tags', '_levels')
+
+    def __init__(self, registrations, pre_trigger_callbacks, unconstrained_priority=DONT_CARE, executor=None,
+                 recorders=(), post_trigger_callbacks=(), trigger_begin_callbacks=(), trigger_end_callbacks=()):
+        super().__init__()
+        self.registrations = tuple(registrations)
+        self.pre_trigger_callbacks = tuple(pre_trigger_callbacks)
+        self.executor = executor
+        self.recorders = tuple(recorders)
+        post_trigger_callbacks = tuple(post_trigger_callbacks) + tuple(recorder.record_handler for recorder in self.recorders)
+        trigger_end_callbacks = tuple(trigger_end_callbacks) + tuple(recorder.record_trigger for recorder in self.recorders)
+        self.post_trigger_callbacks = tuple(post_trigger_callbacks)
+        self.trigger_begin_callbacks = tuple(trigger_begin_callbacks)
+        self.trigger_end_callbacks = tuple(trigger_end_callbacks)
+        # whether triggers need to go through the (slower) timed dispatch path
+        self.is_observed = bool(self.post_trigger_callbacks or self.trigger_begin_callbacks or self.trigger_end_callbacks)
+        self.has_process_handlers = any(registration.executor == PROCESS_EXECUTOR for registration in self.registrations)
+        self.has_batch_handlers = any(registration.batch for registration in self.registrations)
+        self._unconstrained_priority = unconstrained_priority
+        self._tag_index = None
+        self._untagged_positions = None
+        self._registrations_by_tags = {}
+        self._levels = None
+
+    def group_by_level(self, registrations):
+        """Splits ``registrations`` (a subset of this plan's registrations, in call order) into consecutive groups, such
+        that registrations within a group do not depend on each other and may run concurrently
+        """
+        if self._levels is None:
+            self._levels = dict(zip(self.registrations,
+                                    get_dependency_levels(self.registrations, self._unconstrained_priority)))
+        by_level = {}
+        for registration in registrations:
+            by_level.setdefault(self._levels[registration], []).append(registration)
+        return [by_level[level] for level in sorted(by_level)]
+
+    def get_registrations_with_tags(self, tags):
+        """Returns the registrations matching any of ``tags`` (along with the untagged ones, which always match),
+        preserving call order
+        """
+        try:
+            return self._registrations_by_tags[tags]
+        except (KeyError, TypeError):
+            pass
+        key = frozenset(tags)
+        returned = self._registrations_by_tags.get(key)
+        if returned is None:
+            if self._tag_index is None:
+                self._build_tag_index()
+            positions = set(self._untagged_positions)
+            for tag in key:
+                positions.update(self._tag_index.get(tag, ()))
+            returned = tuple(self.registrations[position] for position in sorted(positions))
+            if len(self._registrations_by_tags) >= _MAX_CACHED_TAG_SETS:
+                self._registrations_by_tags.clear()
+            self._registrations_by_tags[key] = returned
+        try:
+            self._registrations_by_tags[tags] = returned
+        except TypeError:  # unhashable tags container, e.g. a list
+            pass
+        return returned
+
+    def _build_tag_index(self):
+        tag_index = {}
+        untagged_positions = []
+        for position, registration in enumerate(self.registrations):
+            if registration.tags is None:
+                untagged_positions.append(position)
+                continue
+            for tag in registration.tags:
+                tag_index.setdefault(tag, []).append(position)
+        self._tag_index = tag_index
+        self._untagged_positions = untagged_positions
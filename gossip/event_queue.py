@@ -0,0 +1,180 @@
+"""Background delivery of hook triggers, used by :func:`gossip.post`
+"""
+import atexit
+import contextvars
+import threading
+from collections import deque
+
+import logbook
+
+from . import hooks
+from .exceptions import EventQueueFull
+
+_logger = logbook.Logger(__name__)
+
+BLOCK = 'BLOCK'
+DROP = 'DROP'
+DROP_OLDEST = 'DROP_OLDEST'
+RAISE = 'RAISE'
+
+_OVERFLOW_POLICIES = (BLOCK, DROP, DROP_OLDEST, RAISE)
+
+DEFAULT_MAX_SIZE = 10000
+
+# how long exiting the interpreter waits for the posted events to be delivered, in seconds
+EXIT_FLUSH_TIMEOUT = 10
+
+
+class EventQueue():
+    """A bounded queue of hook triggers, delivered in order by a background thread through :meth:`gossip.hooks.Hook.trigger`.
+    Each event is delivered within the context (e.g. :func:`gossip.mute_context`) in which it was posted
+
+    :param max_size: the maximum number of events waiting for delivery
+    :param overflow_policy: what to do when posting to a full queue -- ``BLOCK`` until there is room, ``DROP`` the
+           new event, drop the oldest waiting event (``DROP_OLDEST``), or ``RAISE`` :class:`gossip.exceptions.EventQueueFull`
+    """
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, overflow_policy=BLOCK):
+        super().__init__()
+        if max_size < 1:
+            raise ValueError("Event queue size must be positive (got: {0!r})".format(max_size))
+        if overflow_policy not in _OVERFLOW_POLICIES:
+            raise ValueError("Unknown overflow policy: {0!r}".format(overflow_policy))
+        self.max_size = max_size
+        self.overflow_policy = overflow_policy
+        self._events = deque()
+        self._condition = threading.Condition()
+        self._num_pending = 0
+        self._num_dropped = 0
+        self._worker = None
+        self._stopped = False
+
+    def post(self, hook_name, kwargs):
+        """Enqueues a trigger of ``hook_name`` with ``kwargs``, returning whether it was enqueued (``False`` if it was
+        dropped because the queue is full)
+        """
+        event = (hook_name, kwargs, contextvars.copy_context())
+        with self._condition:
+            if self._stopped:
+                raise RuntimeError("Cannot post events to a stopped event queue")
+            while len(self._events) >= self.max_size:
+                if self.overflow_policy == BLOCK:
+                    if threading.current_thread() is self._worker:
+                        break  # posted by a handler -- waiting for the worker would never end
+                    self._condition.wait()
+                elif self.overflow_policy == DROP:
+                    self._num_dropped += 1
+                    return False
+                elif self.overflow_policy == DROP_OLDEST:
+                    self._events.popleft()
+                    self._num_pending -= 1
+                    self._num_dropped += 1
+                else:
+                    raise EventQueueFull("Cannot post {0}: event queue is full ({1} events)".format(
+                        hook_name, self.max_size))
+            self._events.append(event)
+            self._num_pending += 1
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._deliver_events, name='gossip-event-queue', daemon=True)
+                self._worker.start()
+            self._condition.notify_all()
+        return True
+
+    def flush(self, timeout=None):
+        """Waits until all posted events have been delivered, returning whether they were (``False`` on timeout)
+        """
+        if threading.current_thread() is self._worker:
+            raise RuntimeError("Cannot flush an event queue from within one of its handlers")
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._num_pending, timeout=timeout)
+
+    def stop(self, timeout=None):
+        """Delivers the remaining events and stops the worker thread. Events can no longer be posted afterwards
+        """
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+            worker = self._worker
+        if worker is not None:
+            worker.join(timeout)
+
+    def get_num_pending(self):
+        """Returns the number of events posted but not delivered yet
+        """
+        return self._num_pending
+
+    def get_num_dropped(self):
+        """Returns the number of events dropped due to the overflow policy
+        """
+        return self._num_dropped
+
+    def _deliver_events(self):
+        while True:
+            with self._condition:
+                while not self._events:
+                    if self._stopped:
+                        return
+                    self._condition.wait()
+                hook_name, kwargs, context = self._events.popleft()
+                self._condition.notify_all()
+            try:
+                context.run(hooks.trigger, hook_name, **kwargs)
+            except Exception:  # pylint: disable=broad-except
+                _logger.error("Exception raised while delivering posted event of {0}", hook_name, exc_info=True)
+            finally:
+                with self._condition:
+                    self._num_pending -= 1
+                    self._condition.notify_all()
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_event_queue():
+    """Returns the event queue used by :func:`gossip.post`, creating it on first use
+    """
+    global _queue  # pylint: disable=global-statement
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = EventQueue()
+    return _queue
+
+
+def set_event_queue(queue):
+    """Replaces the event queue used by :func:`gossip.post`, stopping the previous one after its events are delivered
+    """
+    global _queue  # pylint: disable=global-statement
+    with _queue_lock:
+        prev, _queue = _queue, queue
+    if prev is not None:
+        prev.stop()
+
+
+def post(hook_name, **kwargs):
+    """Triggers a hook by name in the background, without waiting for its handlers. Events are delivered in the order
+    they were posted, and muting and exception policies apply as with :func:`gossip.trigger` (exceptions are logged).
+
+    :returns: whether the event was enqueued (see :class:`EventQueue` for overflow policies)
+    """
+    return get_event_queue().post(hook_name, kwargs)
+
+
+def flush(timeout=None):
+    """Waits until all events posted with :func:`gossip.post` have been delivered
+    """
+    queue = _queue
+    if queue is None:
+        return True
+    return queue.flush(timeout)
+
+
+def _flush_at_exit():
+    queue = _queue
+    if queue is not None and not queue.flush(EXIT_FLUSH_TIMEOUT):
+        _logger.warning("{0} posted events were not delivered within {1} seconds of exiting",
+                        queue.get_num_pending(), EXIT_FLUSH_TIMEOUT)
+
+
+atexit.register(_flush_at_exit)
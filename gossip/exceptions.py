@@ -32,3 +32,6 @@ class UnsupportedHookTags(Exception):
 
 class UnsupportedHookParams(Exception):
     pass
+
+class EventQueueFull(Exception):
+    pass
@@ -0,0 +1,35 @@
+"""Calling handlers through the executors set with :meth:`gossip.hooks.Hook.set_executor`
+"""
+import contextvars
+from concurrent.futures import Future
+
+# set while a handler runs in an executor worker, so that hooks it triggers call their handlers in that worker rather
+# than waiting for workers of a possibly exhausted pool
+_in_executor_worker = contextvars.ContextVar('gossip_in_executor_worker', default=False)
+
+
+def is_in_executor_worker():
+    return _in_executor_worker.get()
+
+
+def call_inline(func, *args):
+    """Calls ``func`` in the current thread, returning a completed future holding its outcome
+    """
+    returned = Future()
+    try:
+        returned.set_result(func(*args))
+    except Exception as e:  # pylint: disable=broad-except
+        returned.set_exception(e)
+    return returned
+
+
+def submit(executor, func, *args):
+    """Submits ``func`` to ``executor``, calling it in a copy of the current context, so that non-reentrant handlers
+    triggering their hook again through the executor are still detected
+    """
+    return executor.submit(contextvars.copy_context().run, _call_in_worker, func, *args)
+
+
+def _call_in_worker(func, *args):
+    _in_executor_worker.set(True)
+    return func(*args)
@@ -1,12 +1,20 @@
+from concurrent.futures import Executor
+
 from . import registry
 from ._compat import itervalues, iteritems
 from .exception_policy import ExceptionPolicy, Inherit, RaiseImmediately
 from .exceptions import GroupNotFound, NameAlreadyUsed
 from .helpers import DONT_CARE
+from .muting import get_group_mute_var, num_muted_groups
+from .registration import get_token_registrations, is_indexed_token
 
 
 class Group():
 
+    __slots__ = ('name', 'full_name', '_parent', '_strict', '_can_be_muted', '_unconstrained_handler_priority',
+                 '_children', '_parent_exception_policy', '_exception_policy', '_executor', '_muted',
+                 '_handler_time_budget')
+
     def __init__(self, name, parent=None):
         super().__init__()
         self.name = name
@@ -16,6 +24,7 @@ class Group():
                 self._parent.full_name, self.name)
         else:
             self.full_name = name
+        self._muted = get_group_mute_var(self.full_name)
         self.reset()
 
     def is_global(self):
@@ -25,21 +34,25 @@ class Group():
         return self._strict
 
     def undefine(self):
-        self.undefine_children()
-        if self._parent is not None:
-            self._parent.remove_child(self.name)
-        registry.groups.pop(self.full_name)
+        with registry.lock:
+            self.undefine_children()
+            if self._parent is not None:
+                self._parent.remove_child(self.name)
+            registry.groups.pop(self.full_name)
 
     def reset(self):
-        if hasattr(self, "_children"):
-            self.undefine_children()
-        self._strict = False
-        self._can_be_muted = None
-        self._unconstrained_handler_priority = DONT_CARE
-        self._children = {}
-        self._parent_exception_policy = None
-        self.set_exception_policy(
-            RaiseImmediately() if self._parent is None else Inherit())
+        with registry.lock:
+            if hasattr(self, "_children"):
+                self.undefine_children()
+            self._strict = False
+            self._can_be_muted = None
+            self._unconstrained_handler_priority = DONT_CARE
+            self._children = {}
+            self._parent_exception_policy = None
+            self._executor = None
+            self._handler_time_budget = None
+            self.set_exception_policy(
+                RaiseImmediately() if self._parent is None else Inherit())
 
     def set_unconstrained_handler_priority(self, priority):
         """Controls when handlers without needs/provides specifications should be fired
@@ -47,11 +60,12 @@ class Group():
 
         :param priority: ``gossip.FIRST`` means that unconstrained handlers should be fired first, ``gossip.LAST`` means last
         """
-        self._unconstrained_handler_priority = priority
-        for hook in self.iter_hooks():
-            hook.recompute_call_order()
-        for group in self.iter_subgroups():
-            group.set_unconstrained_handler_priority(priority)
+        with registry.lock:
+            self._unconstrained_handler_priority = priority
+            for hook in self.iter_hooks():
+                hook.recompute_call_order()
+            for group in self.iter_subgroups():
+                group.set_unconstrained_handler_priority(priority)
 
     def get_unconstrained_handler_priority(self):
         return self._unconstrained_handler_priority
@@ -65,12 +79,13 @@ class Group():
 
         :param strict: controls whether or not this group should be turned to strict
         """
-        for child in itervalues(self._children):
-            if isinstance(child, Group):
-                child.set_strict(strict)
-            elif strict:
-                child.validate_strict()
-        self._strict = strict
+        with registry.lock:
+            for child in itervalues(self._children):
+                if isinstance(child, Group):
+                    child.set_strict(strict)
+                elif strict:
+                    child.validate_strict()
+            self._strict = strict
 
     def allow_muting(self):
         self._can_be_muted = True
@@ -85,6 +100,20 @@ class Group():
             return True
         return self._parent.can_be_muted()
 
+    def is_muted(self):
+        """Returns whether this group or one of its parents is muted in the current context
+
+        .. seealso:: :func:`gossip.mute_context`
+        """
+        if not num_muted_groups.get():
+            return False
+        group = self
+        while group is not None:
+            if group._muted.get():  # pylint: disable=protected-access
+                return True
+            group = group._parent  # pylint: disable=protected-access
+        return False
+
     def get_undefined_hooks(self):
         returned = [
             hook for hook in self.get_hooks() if not hook.is_defined()]
@@ -106,7 +135,8 @@ class Group():
         return list(self.iter_subgroups())
 
     def iter_subgroups(self):
-        for child in itervalues(self._children):
+        # iterating over a copy, since children may be added by other threads meanwhile
+        for child in list(itervalues(self._children)):
             if isinstance(child, Group):
                 yield child
 
@@ -114,7 +144,7 @@ class Group():
         return list(self.iter_hooks())
 
     def iter_hooks(self, recursive=False):
-        for child in itervalues(self._children):
+        for child in list(itervalues(self._children)):
             if not isinstance(child, Group):
                 yield child
             elif recursive:
@@ -127,12 +157,28 @@ class Group():
     def unregister_token(self, token):
         """Unregisters all handlers that were registered with ``token`` in this group
         """
-        for hook in self.iter_hooks(recursive=True):
-            for registration in hook.get_registrations(include_empty=True):
-                if registration.token == token:
+        with registry.lock:
+            if is_indexed_token(token):
+                registrations = get_token_registrations(token)
+            else:
+                registrations = [registration for hook in self.iter_hooks(recursive=True)
+                                 for registration in hook.get_registrations(include_empty=True)
+                                 if registration.token == token]
+            for registration in registrations:
+                hook = registration.hook
+                if hook is not None and self.contains_group(hook.group):
                     registration.invalidate()
                     registration.unregister()
 
+    def contains_group(self, group):
+        """Returns whether ``group`` is this group or one of its (recursive) subgroups
+        """
+        while group is not None:
+            if group is self:
+                return True
+            group = group._parent  # pylint: disable=protected-access
+        return False
+
     def set_exception_policy(self, policy):
         """ Determines how exceptions are handled by hooks in this group
         """
@@ -158,6 +204,51 @@ class Group():
             return returned
         return self._exception_policy
 
+    def set_executor(self, executor):
+        """Runs handlers of hooks in this group (and its subgroups) through ``executor``, e.g. a
+        :class:`concurrent.futures.ThreadPoolExecutor`. Handlers are dispatched level by level: handlers that do not
+        depend on each other through needs/provides are submitted together, and each level completes before the next
+        one starts.
+
+        :param executor: a :class:`concurrent.futures.Executor`, or ``None`` to inherit the parent group's executor
+               (the global group calls handlers inline by default)
+        """
+        if executor is not None and not isinstance(executor, Executor):
+            raise ValueError(
+                "Expected concurrent.futures.Executor instance. Got {0!r}".format(executor))
+        with registry.lock:
+            self._executor = executor
+            for hook in self.iter_hooks(recursive=True):
+                hook._invalidate_dispatch_plan()  # pylint: disable=protected-access
+
+    def get_executor(self):
+        """Returns the executor used to call handlers of hooks in this group, or ``None`` if they are called inline
+        """
+        if self._executor is not None or self._parent is None:
+            return self._executor
+        return self._parent.get_executor()
+
+    def set_handler_time_budget(self, budget_ms):
+        """Reports handlers of hooks in this group (and its subgroups) taking longer than ``budget_ms`` milliseconds, by
+        logging a warning and triggering ``gossip.on_slow_handler``
+
+        :param budget_ms: the budget in milliseconds, or ``None`` to inherit the parent group's budget (the global group
+               has no budget by default)
+        """
+        if budget_ms is not None and budget_ms <= 0:
+            raise ValueError("Handler time budget must be positive (got: {0!r})".format(budget_ms))
+        with registry.lock:
+            self._handler_time_budget = budget_ms
+            for hook in self.iter_hooks(recursive=True):
+                hook._invalidate_dispatch_plan()  # pylint: disable=protected-access
+
+    def get_handler_time_budget(self):
+        """Returns the handler time budget of hooks in this group in milliseconds, or ``None`` if there is none
+        """
+        if self._handler_time_budget is not None or self._parent is None:
+            return self._handler_time_budget
+        return self._parent.get_handler_time_budget()
+
     def __repr__(self):
         return "<Gossip group {0!r}>".format(self.name)
 
@@ -171,16 +262,21 @@ def get_global_group():
 def get_groups():
     """Gets all defined groups (including the global group)
     """
-    return list(group for group_name, group in iteritems(registry.groups) if group_name is not None)
+    with registry.lock:
+        return list(group for group_name, group in iteritems(registry.groups) if group_name is not None)
 
 
 def get_or_create_group(name):
     """Tries to retrieve an existing group, and if it doesn't exist, create a new group
     """
-    try:
-        return get_group(name)
-    except GroupNotFound:
-        return create_group(name)
+    returned = registry.groups.get(name)
+    if returned is not None:
+        return returned
+    with registry.lock:
+        try:
+            return get_group(name)
+        except GroupNotFound:
+            return create_group(name)
 
 
 def get_group(name):
@@ -199,6 +295,11 @@ def create_group(name):
 
     :rtype: :class:`gossip.group.Group`
     """
+    with registry.lock:
+        return _create_group(name)
+
+
+def _create_group(name):
     if name in registry.groups:
         raise NameAlreadyUsed(
             "Group with name {0} already exists".format(name))
@@ -1,20 +1,31 @@
+import asyncio
 import functools
+from concurrent.futures import Executor, wait as wait_for_futures
 import logbook
 import sys
 from collections import OrderedDict
-from contextlib import contextmanager
-from types import GeneratorType
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
 from sentinels import Sentinel
 
 from . import groups, registry
 from ._compat import itervalues, string_types
+from .coalesce import Coalescer
+from .dispatch_plan import DispatchPlan
+from .exception_policy import RaiseImmediately
+from .executors import call_inline, is_in_executor_worker, submit
 from .exceptions import (CannotResolveDependencies, HookNotFound,
                          NameAlreadyUsed, NotNowException, UndefinedHook,
-                         CannotMuteHooks, UnsupportedHookParams,
+                         UnsupportedHookParams,
                          IllegalHookName,
                          UnsupportedHookTags)
-from .registration import Registration
-from .utils import topological_sort_registrations
+from .bulk import _get_bulk_registrations, bulk_registration  # pylint: disable=unused-import
+from .muting import get_hook_mute_var, mute_context, num_muted_groups  # pylint: disable=unused-import
+from .process_pool import get_process_pool
+from .registration import PROCESS_EXECUTOR, Registration, _index_token, _unindex_token
+from .stats import discard_recorder, get_recorder
+from .tracing import get_tracer
+from .utils import insert_by_priority, is_sorted_by_priority, sort_dependency_components, topological_sort_registrations
 
 from vintage import warn_deprecation
 
@@ -22,9 +33,18 @@ _logger = logbook.Logger(__name__)
 
 _REGISTER_NO_OP = Sentinel('REGISTER_NO_OP')
 
+# hooks triggered by gossip itself, whose handlers do not trigger internal hooks again
+_INTERNAL_HOOK_NAMES = frozenset(['gossip.on_handler_exception', 'gossip.on_slow_handler'])
+
 
 class Hook():
 
+    __slots__ = ('group', 'name', 'tags', 'full_name', 'doc', 'deprecated', '_registrations', '_empty_regisrations',
+                 '_arguments', '_argument_names', '_typed_arguments', '_trigger_internal_hooks', '_defined', '_pre_trigger_callbacks', '_dispatch_plan',
+                 '_post_trigger_callbacks', '_trigger_begin_callbacks', '_trigger_end_callbacks',
+                 '_unmet_deps', '_needs_counts', '_provides_counts', '_num_constrained', '_is_priority_sorted',
+                 '_can_be_muted', '_executor', '_muted', '_coalescer')
+
     def __init__(self, group, name, arg_names=None, doc=None, deprecated=False, can_be_muted=None):
         super().__init__()
         self.group = group
@@ -35,14 +55,27 @@ class Hook():
         else:
             self.full_name = "{0}.{1}".format(self.group.full_name, self.name)
         registry.hooks[self.full_name] = self
+        self._muted = get_hook_mute_var(self.full_name)
         self._registrations = []
         self._empty_regisrations = []
         self._arguments = None
-        self._trigger_internal_hooks = self.full_name != "gossip.on_handler_exception"
+        self._argument_names = None
+        self._typed_arguments = ()
+        self._trigger_internal_hooks = self.full_name not in _INTERNAL_HOOK_NAMES
         self._defined = False
         self._pre_trigger_callbacks = []
-        self._unmet_deps = frozenset()
+        self._post_trigger_callbacks = []
+        self._trigger_begin_callbacks = []
+        self._trigger_end_callbacks = []
+        self._dispatch_plan = None
+        self._executor = None
+        self._unmet_deps = set()
+        self._needs_counts = {}
+        self._provides_counts = {}
+        self._num_constrained = 0
+        self._is_priority_sorted = True
         self._can_be_muted = None
+        self._coalescer = None
         self.doc = None
         self.deprecated = None
         self.configure(arg_names=arg_names, doc=doc, deprecated=deprecated, can_be_muted=can_be_muted)
@@ -53,6 +86,10 @@ class Hook():
             assert self._arguments is None, "Cannot override exists arg_names {} with {}".format(
                 list(self._arguments), list(normalized_args))
             self._arguments = normalized_args
+            # compiled once, so that validating a valid trigger only takes a keyset comparison and type checks
+            self._argument_names = frozenset(normalized_args)
+            self._typed_arguments = tuple((arg_name, arg_types) for arg_name, arg_types in normalized_args.items()
+                                          if arg_types is not None)
 
         doc = kwargs.pop('doc', None)
         if doc is not None:
@@ -66,13 +103,20 @@ class Hook():
         if can_be_muted is not None:
             self._can_be_muted = can_be_muted
 
+        coalesce = kwargs.pop('coalesce', None)
+        debounce_ms = kwargs.pop('debounce_ms', None)
+        if coalesce is not None or debounce_ms is not None:
+            self._configure_coalescing(coalesce, debounce_ms)
+
         if kwargs:
             raise UnsupportedHookParams("Unsupported hook params: {}".format(', '.join(kwargs)))
 
-    def _get_registration_list_from_func(self, func):
-        if func is _REGISTER_NO_OP:
-            return self._empty_regisrations
-        return self._registrations
+    def _configure_coalescing(self, coalesce, debounce_ms):
+        if coalesce is False and debounce_ms is None:
+            self._coalescer = None
+            return
+        merge = None if coalesce is None or coalesce is True else coalesce
+        self._coalescer = Coalescer(self, merge=merge, debounce_ms=debounce_ms)
 
     def _normalize_arguments(self, arg_names):
         if arg_names is None:
@@ -94,25 +138,126 @@ class Hook():
             return self._can_be_muted
         return self.group.can_be_muted()
 
+    def is_muted(self):
+        """Returns whether this hook (or one of its groups) is muted in the current context
+        """
+        return bool(self._muted.get() or (num_muted_groups.get() and self.group.is_muted() and self.can_be_muted()))
+
     def add_pre_trigger_callback(self, callback):
-        self._pre_trigger_callbacks.append(callback)
-        return callback
+        return self._add_callback('_pre_trigger_callbacks', callback)
 
     def remove_pre_trigger_callback(self, callback):
-        self._pre_trigger_callbacks.remove(callback)
+        self._remove_callback('_pre_trigger_callbacks', callback)
+
+    def add_post_trigger_callback(self, callback):
+        """Calls ``callback(registration, kwargs, elapsed, exc_info)`` after each handler call, in the thread that called
+        the handler. ``elapsed`` is the duration of the call in seconds, and ``exc_info`` is ``None`` unless the handler
+        raised an exception. Handlers called in the process pool by synchronous triggers are not reported
+        """
+        return self._add_callback('_post_trigger_callbacks', callback)
+
+    def remove_post_trigger_callback(self, callback):
+        self._remove_callback('_post_trigger_callbacks', callback)
+
+    def add_trigger_begin_callback(self, callback):
+        """Calls ``callback(hook, kwargs)`` before the handlers of each trigger (and each event passed to :meth:`trigger_many`)
+        are called
+        """
+        return self._add_callback('_trigger_begin_callbacks', callback)
+
+    def remove_trigger_begin_callback(self, callback):
+        self._remove_callback('_trigger_begin_callbacks', callback)
+
+    def add_trigger_end_callback(self, callback):
+        """Calls ``callback(hook, kwargs, elapsed, exc_info)`` after the handlers of each trigger were called, where
+        ``exc_info`` describes the exception propagating from the handlers, if any
+        """
+        return self._add_callback('_trigger_end_callbacks', callback)
+
+    def remove_trigger_end_callback(self, callback):
+        self._remove_callback('_trigger_end_callbacks', callback)
+
+    def _add_callback(self, attr_name, callback):
+        with registry.lock:
+            setattr(self, attr_name, getattr(self, attr_name) + [callback])
+            self._invalidate_dispatch_plan()
+        return callback
+
+    def _remove_callback(self, attr_name, callback):
+        with registry.lock:
+            callbacks = list(getattr(self, attr_name))
+            callbacks.remove(callback)
+            setattr(self, attr_name, callbacks)
+            self._invalidate_dispatch_plan()
+
+    def set_executor(self, executor):
+        """Runs this hook's handlers through ``executor``, overriding the group's setting.
+
+        .. seealso:: :meth:`gossip.groups.Group.set_executor`
+        """
+        if executor is not None and not isinstance(executor, Executor):
+            raise ValueError(
+                "Expected concurrent.futures.Executor instance. Got {0!r}".format(executor))
+        with registry.lock:
+            self._executor = executor
+            self._invalidate_dispatch_plan()
+
+    def get_executor(self):
+        if self._executor is not None:
+            return self._executor
+        return self.group.get_executor()
+
+    def _invalidate_dispatch_plan(self):
+        self._dispatch_plan = None
+
+    def _get_dispatch_plan(self):
+        returned = self._dispatch_plan
+        if returned is None:
+            # built under the lock, so that a concurrent invalidation cannot be overwritten by a stale plan
+            with registry.lock:
+                returned = self._dispatch_plan
+                if returned is None:
+                    returned = self._dispatch_plan = DispatchPlan(
+                        self._registrations, self._pre_trigger_callbacks,
+                        self.group.get_unconstrained_handler_priority(), self.get_executor(), self._get_recorders(),
+                        self._get_post_trigger_callbacks(), self._trigger_begin_callbacks, self._trigger_end_callbacks)
+        return returned
+
+    def _get_post_trigger_callbacks(self):
+        budget_ms = self.group.get_handler_time_budget()
+        if budget_ms is None or not self._trigger_internal_hooks:
+            return self._post_trigger_callbacks
+        return self._post_trigger_callbacks + [functools.partial(self._check_handler_time, budget_ms)]
+
+    def _check_handler_time(self, budget_ms, registration, kwargs, elapsed, exc_info):  # pylint: disable=unused-argument
+        elapsed_ms = elapsed * 1000
+        if elapsed_ms <= budget_ms:
+            return
+        _logger.warning("Handler {0} of hook {1} took {2:.1f}ms, exceeding its budget of {3}ms",
+                        registration.get_qualified_name(), self.full_name, elapsed_ms, budget_ms)
+        trigger("gossip.on_slow_handler", handler=registration.func, hook=self, elapsed_ms=elapsed_ms, budget_ms=budget_ms)
+
+    def _get_recorders(self):
+        return [recorder for recorder in (get_recorder(self), get_tracer()) if recorder is not None]
 
     def undefine(self):
-        self.group.remove_child(self.name)
-        registry.hooks.pop(self.full_name)
+        with registry.lock:
+            self.group.remove_child(self.name)
+            registry.hooks.pop(self.full_name)
+            for registration in self._registrations + self._empty_regisrations:
+                _unindex_token(registration)
+            discard_recorder(self)
 
     def set_tags(self, tags):
         assert not self.tags, "Cannot override exists tags {} with {}".format(self.tags, tags)
         self.tags = tags
 
     def get_registrations(self, include_empty=False):
-        returned = list(self._registrations)
-        if include_empty:
-            returned += list(self._empty_regisrations)
+        # the call order is rewritten in place while registering, so it is copied under the lock
+        with registry.lock:
+            returned = list(self._registrations)
+            if include_empty:
+                returned += self._empty_regisrations
         return returned
 
     def mark_defined(self):
@@ -141,7 +286,15 @@ class Hook():
     def validate_kwargs(self, kwargs):
         if self._arguments is None or not self.group.is_strict():
             return
+        if kwargs.keys() == self._argument_names:
+            for arg_name, arg_types in self._typed_arguments:
+                if not isinstance(kwargs[arg_name], arg_types):
+                    break
+            else:
+                return
+        self._raise_invalid_kwargs(kwargs)
 
+    def _raise_invalid_kwargs(self, kwargs):
         unknown = set(kwargs) - set(self._arguments)
         if unknown:
             raise TypeError('Unknown arguments specified: {}'.format(', '.join(unknown)))
@@ -153,13 +306,12 @@ class Hook():
                 raise TypeError('Incorrect type for argument {}. Expected {!r}, got {!r}'.format(
                     arg_name, arg_types, type(kwargs[arg_name])))
 
-
     def validate_strict(self, registrations_to_validate=None):
         if not self._defined:
             raise UndefinedHook(
                 "hook {0} wasn't defined yet".format(self.full_name))
         if registrations_to_validate is None:
-            registrations_to_validate = self._registrations + self._empty_regisrations
+            registrations_to_validate = self.get_registrations(include_empty=True)
         for registration in registrations_to_validate:
             self.validate_tags(registration.tags, is_strict=True)
 
@@ -169,19 +321,81 @@ class Hook():
         if self.deprecated:
             warn_deprecation('Hook {0} is deprecated!'.format(self.full_name), frame_correction=+1)
         new_registration = Registration(func, self, token=token, tags=tags, needs=needs, provides=provides, **kwargs)
+        with registry.lock:
+            self._register(new_registration)
+        return new_registration
+
+    def _register(self, new_registration):
         if self.group.is_strict():
             self.validate_strict([new_registration])
-        need_sorting = self._registrations and new_registration.priority > self._registrations[-1].priority
-        self._get_registration_list_from_func(func).append(new_registration)
-        if need_sorting:
-            self._registrations.sort(key=Registration.get_priority, reverse=True) # sort is stable, so order among registration isn't disturbed
-        if new_registration.needs or new_registration.provides:
-            try:
-                self.recompute_call_order()
-            except:
-                self._registrations.pop()
-                raise
-        return new_registration
+        pending = _get_bulk_registrations()
+        if pending is not None:
+            pending.setdefault(self, []).append(new_registration)
+            return
+        if self._insert_into_call_order(self._registrations, [new_registration]):
+            self._is_priority_sorted = is_sorted_by_priority(self._registrations)
+        self._add_registrations([new_registration])
+
+    def _insert_into_call_order(self, registrations, new_registrations):
+        """Inserts handlers into ``registrations`` (the call order of this hook, or a copy of it) by priority,
+        re-sorting only the handlers whose order they break. Returns whether handlers were re-sorted. If the handlers
+        cannot be ordered, ``registrations`` is left unchanged and :class:`.CannotResolveDependencies` is raised
+        """
+        unconstrained_priority = self.group.get_unconstrained_handler_priority()
+        inserted = []
+        constrained = []
+        for registration in new_registrations:
+            if registration.func is _REGISTER_NO_OP:
+                continue
+            index = insert_by_priority(registrations, registration, unconstrained_priority,
+                                       self._num_constrained + len(constrained), self._is_priority_sorted)
+            inserted.append(registration)
+            if registration.needs or registration.provides:
+                constrained.append(registration)
+            if self._is_priority_sorted:
+                priority = registration.priority
+                self._is_priority_sorted = (index == 0 or registrations[index - 1].priority >= priority) and \
+                    (index == len(registrations) - 1 or priority >= registrations[index + 1].priority)
+        try:
+            return bool(constrained) and sort_dependency_components(registrations, constrained)
+        except CannotResolveDependencies:
+            for registration in inserted:
+                registrations.remove(registration)
+            raise
+
+    def _add_registrations(self, new_registrations):
+        """Accounts for handlers which were inserted into the call order
+        """
+        for registration in new_registrations:
+            _index_token(registration)
+            if registration.func is _REGISTER_NO_OP:
+                self._empty_regisrations.append(registration)
+            elif registration.needs or registration.provides:
+                self._num_constrained += 1
+            self._add_dependencies(registration)
+        self._invalidate_dispatch_plan()
+
+    def _add_dependencies(self, registration):
+        for need in registration.needs:
+            self._needs_counts[need] = self._needs_counts.get(need, 0) + 1
+            if need not in self._provides_counts:
+                self._unmet_deps.add(need)
+        for provided in registration.provides:
+            self._provides_counts[provided] = self._provides_counts.get(provided, 0) + 1
+            self._unmet_deps.discard(provided)
+
+    def _remove_dependencies(self, registration):
+        for need in registration.needs:
+            self._needs_counts[need] -= 1
+            if not self._needs_counts[need]:
+                del self._needs_counts[need]
+                self._unmet_deps.discard(need)
+        for provided in registration.provides:
+            self._provides_counts[provided] -= 1
+            if not self._provides_counts[provided]:
+                del self._provides_counts[provided]
+                if provided in self._needs_counts:
+                    self._unmet_deps.add(provided)
 
     def register_no_op(self, **kwargs):
         if kwargs.get('needs'):
@@ -189,71 +403,370 @@ class Hook():
         return self.register(func=_REGISTER_NO_OP, **kwargs)
 
     def recompute_call_order(self):
-        self._registrations = topological_sort_registrations(self._registrations, unconstrained_priority=self.group.get_unconstrained_handler_priority())
-        self._unmet_deps = frozenset(n for r in self._registrations for n in r.needs) - \
-                           frozenset(p for r in (self._registrations + self._empty_regisrations) for p in r.provides)
-
+        with registry.lock:
+            registrations = self._registrations = topological_sort_registrations(
+                self._registrations, unconstrained_priority=self.group.get_unconstrained_handler_priority())
+            self._is_priority_sorted = is_sorted_by_priority(registrations)
+            self._invalidate_dispatch_plan()
 
     def unregister(self, registration):
-        assert registration.hook is self
-        self._get_registration_list_from_func(registration.func).remove(registration)
-        registration.hook = None
-        self.recompute_call_order()
+        with registry.lock:
+            assert registration.hook is self
+            pending = _get_bulk_registrations()
+            if pending is not None and registration in pending.get(self, ()):
+                registration.hook = None  # deferred by bulk_registration, so it was not added yet
+                return
+            if registration.func is _REGISTER_NO_OP:
+                self._empty_regisrations.remove(registration)
+            else:
+                self._registrations.remove(registration)
+            registration.hook = None
+            _unindex_token(registration)
+            self._remove_dependencies(registration)
+            self._invalidate_dispatch_plan()
+            # removing a handler cannot invalidate the order of the remaining ones
+            if registration.func is not _REGISTER_NO_OP and (registration.needs or registration.provides):
+                self._num_constrained -= 1
 
     def unregister_all(self):
-        del self._registrations[:]
-        del self._empty_regisrations[:]
-        self.recompute_call_order()
-
-    def trigger(self, kwargs, tags=None):
+        with registry.lock:
+            for registration in self._registrations + self._empty_regisrations:
+                _unindex_token(registration)
+            for registration in (_get_bulk_registrations() or {}).get(self, ()):
+                registration.hook = None  # dropping handlers deferred by bulk_registration
+            del self._registrations[:]
+            del self._empty_regisrations[:]
+            self._unmet_deps.clear()
+            self._needs_counts.clear()
+            self._provides_counts.clear()
+            self._num_constrained = 0
+            self._is_priority_sorted = True
+            self._invalidate_dispatch_plan()
+            discard_recorder(self)
+
+    def _prepare_trigger(self, tags):
+        """Performs the checks preceding a trigger, returning the dispatch plan and the registrations to call, or
+        ``(None, ())`` if the hook is muted
+        """
         if self._unmet_deps:
-            deps_str = ', '.join([str(dep) for dep in self._unmet_deps])
-            raise CannotResolveDependencies('Hook {0!r} has unmet dependencies: {1}'.format(self, deps_str),
-                                            unmet_deps=self._unmet_deps)
-        if self.full_name in _muted_stack[-1]:
+            with registry.lock:
+                unmet_deps = frozenset(self._unmet_deps)
+            if unmet_deps:
+                deps_str = ', '.join([str(dep) for dep in unmet_deps])
+                raise CannotResolveDependencies('Hook {0!r} has unmet dependencies: {1}'.format(self, deps_str),
+                                                unmet_deps=unmet_deps)
+        if self.is_muted():
             _logger.debug("Hook {0!r} muted, skipping trigger", self)
-            return
+            return None, ()
 
         self.validate_tags(tags)
+        plan = self._get_dispatch_plan()
+        registrations = plan.registrations if tags is None else plan.get_registrations_with_tags(tags)
+        return plan, registrations
+
+    def trigger(self, kwargs, tags=None):
+        if not self._registrations and not self.group.is_strict():
+            return
+        if self._coalescer is not None and not self.is_muted() and self._coalescer.defer(kwargs, tags):
+            return
+        plan, registrations = self._prepare_trigger(tags)
+        if plan is None:
+            return
         self.validate_kwargs(kwargs)
+        if not registrations:
+            return
+        if plan.has_batch_handlers:
+            self._trigger_many(plan, registrations, (kwargs,), is_single_trigger=True)
+            return
         exception_policy = self.group.get_exception_policy()
+        with exception_policy.context() as ctx:
+            self._dispatch(plan, registrations, kwargs, exception_policy, ctx)
 
-        registrations = self._registrations
-        deferred = []
+    def trigger_many(self, kwargs_iterable, tags=None):
+        """Triggers the hook once for each dictionary of keyword arguments in ``kwargs_iterable``. Muting, tags and the
+        exception policy are resolved once for the entire batch, and exceptions are handled as if the batch were a
+        single trigger.
 
+        Handlers registered with ``batch=True`` are called once, after the other handlers processed all of the events,
+        receiving the list of keyword argument dictionaries as their ``events`` argument. Since they always run last,
+        batch handlers cannot take part in needs/provides dependencies
+        """
+        if not self._registrations and not self.group.is_strict():
+            return
+        plan, registrations = self._prepare_trigger(tags)
+        if plan is None:
+            return
+        if self._arguments is not None and self.group.is_strict():
+            kwargs_iterable = self._iter_validated(kwargs_iterable)
+        self._trigger_many(plan, registrations, kwargs_iterable)
+
+    def _iter_validated(self, kwargs_iterable):
+        for kwargs in kwargs_iterable:
+            self.validate_kwargs(kwargs)
+            yield kwargs
+
+    def _trigger_many(self, plan, registrations, kwargs_iterable, is_single_trigger=False):
+        """Calls the handlers once per event, and the batch handlers once for all of them. Each event is observed as a
+        trigger (see :meth:`add_trigger_begin_callback`), except for a single trigger, which is observed along with its
+        batch handlers
+        """
+        if plan.has_batch_handlers:
+            event_registrations = tuple(registration for registration in registrations if not registration.batch)
+            batch_registrations = tuple(registration for registration in registrations if registration.batch)
+        else:
+            event_registrations, batch_registrations = registrations, ()
+        call_registration = self._get_call_registration(plan)
+        observe_events = plan.is_observed and not is_single_trigger
+        observe_trigger = self._observe_trigger(plan, kwargs_iterable[0]) if plan.is_observed and is_single_trigger \
+            else nullcontext()
+        events = []
+        exception_policy = self.group.get_exception_policy()
         with exception_policy.context() as ctx:
-            while True:
-                any_resolved = False
-                for registration in list(registrations):
-                    if not registration.is_active():
-                        _logger.trace("Skipping {} because it is inactive", registration)
-                        continue
-                    if not registration.has_tags(tags):
-                        continue
+            with observe_trigger:
+                for kwargs in kwargs_iterable:
+                    if batch_registrations:
+                        events.append(kwargs)
+                    if observe_events:
+                        with self._observe_trigger(plan, kwargs):
+                            self._dispatch(plan, event_registrations, kwargs, exception_policy, ctx, call_registration)
+                    elif event_registrations:
+                        self._dispatch(plan, event_registrations, kwargs, exception_policy, ctx, call_registration)
+                if events:
+                    self._dispatch(plan, batch_registrations, {'events': events}, exception_policy, ctx,
+                                   call_registration)
+
+    def _dispatch(self, plan, registrations, kwargs, exception_policy, ctx, call_registration=None):
+        """Calls ``registrations`` with ``kwargs`` in call order, within an exception policy context
+        """
+        if call_registration is None:
+            if plan.is_observed:
+                self._dispatch_observed(plan, registrations, kwargs, exception_policy, ctx)
+                return
+            call_registration = self._call_registration
+        if plan.executor is not None or plan.has_process_handlers:
+            self._dispatch_by_level(plan, registrations, kwargs, exception_policy, ctx, call_registration)
+            return
+        pre_trigger_callbacks = plan.pre_trigger_callbacks
+        deferred = []
+
+        while True:
+            any_resolved = False
+            for registration in registrations:
+                if not registration.is_active():
+                    _logger.trace("Skipping {} because it is inactive", registration)
+                    continue
+                try:
+                    exc_info = call_registration(registration, kwargs, pre_trigger_callbacks)
+                except NotNowException:
+                    deferred.append(registration)
+                    continue
+                else:
+                    any_resolved = True
+                if exc_info is not None:
+                    exception_policy.handle_exception(ctx, exc_info)
+            if deferred:
+                if not any_resolved:
+                    raise CannotResolveDependencies(
+                        "Cannot resolve handler dependencies for {0}".format(self))
+                registrations = deferred
+                deferred = []
+            else:
+                break
+
+    def _dispatch_observed(self, plan, registrations, kwargs, exception_policy, ctx):
+        with self._observe_trigger(plan, kwargs):
+            self._dispatch(plan, registrations, kwargs, exception_policy, ctx, self._get_call_registration(plan))
+
+    def _get_call_registration(self, plan, is_async=False):
+        if plan.is_observed:
+            call_registration_observed = self._call_registration_async_observed if is_async else \
+                self._call_registration_observed
+            return functools.partial(call_registration_observed, plan.post_trigger_callbacks)
+        return self._call_registration_async if is_async else self._call_registration
+
+    @contextmanager
+    def _observe_trigger(self, plan, kwargs):
+        for callback in plan.trigger_begin_callbacks:
+            callback(self, kwargs)
+        exc_info = None
+        started = perf_counter()
+        try:
+            yield
+        except BaseException:
+            exc_info = sys.exc_info()
+            raise
+        finally:
+            elapsed = perf_counter() - started
+            for callback in plan.trigger_end_callbacks:
+                callback(self, kwargs, elapsed, exc_info)
+
+    def _dispatch_by_level(self, plan, registrations, kwargs, exception_policy, ctx, call_registration):
+        pre_trigger_callbacks = plan.pre_trigger_callbacks
+        stop_on_failure = isinstance(exception_policy, RaiseImmediately)
+        deferred = []
+
+        while True:
+            any_resolved = False
+            for level in plan.group_by_level(registrations):
+                level = [registration for registration in level if registration.is_active()]
+                futures = self._submit_level(plan.executor, level, kwargs, pre_trigger_callbacks, call_registration,
+                                             stop_on_failure)
+                wait_for_futures([future for future in futures if future is not None])
+                for registration, future in zip(level, futures):
                     try:
-                        exc_info = self._call_registration(
-                            registration, kwargs)
+                        exc_info = self._get_outcome(registration, future)
                     except NotNowException:
                         deferred.append(registration)
                         continue
-                    else:
-                        any_resolved = True
+                    any_resolved = True
                     if exc_info is not None:
                         exception_policy.handle_exception(ctx, exc_info)
-                if deferred:
-                    if not any_resolved:
-                        raise CannotResolveDependencies(
-                            "Cannot resolve handler dependencies for {0}".format(self))
-                    registrations = deferred
-                    deferred = []
-                else:
+            if deferred:
+                if not any_resolved:
+                    raise CannotResolveDependencies(
+                        "Cannot resolve handler dependencies for {0}".format(self))
+                registrations = deferred
+                deferred = []
+            else:
+                break
+
+    def _submit_level(self, executor, level, kwargs, pre_trigger_callbacks, call_registration, stop_on_failure):
+        """Starts calling the registrations of a dependency level, returning a future for each registration (or ``None``
+        for handlers which were not called). Process handlers are submitted first, so they run while the other handlers
+        are called. Handlers called inline are called in order, stopping at the first failure if ``stop_on_failure``
+        """
+        futures = [None] * len(level)
+        for index, registration in enumerate(level):
+            if registration.executor == PROCESS_EXECUTOR and (registration.reentrant or not registration.is_being_called()):
+                for callback in pre_trigger_callbacks:
+                    callback(registration, kwargs)
+                futures[index] = registration.submit_to(get_process_pool(), **kwargs)
+        for index, registration in enumerate(level):
+            if registration.executor == PROCESS_EXECUTOR:
+                continue
+            if executor is None or len(level) == 1 or is_in_executor_worker():
+                futures[index] = call_inline(call_registration, registration, kwargs, pre_trigger_callbacks)
+                if stop_on_failure and futures[index].exception() is None and futures[index].result() is not None:
                     break
+            else:
+                futures[index] = submit(executor, call_registration, registration, kwargs, pre_trigger_callbacks)
+        return futures
+
+    def _get_outcome(self, registration, future):
+        """Returns the exc_info of a completed call made by :meth:`_submit_level`, or ``None`` if it succeeded
+        """
+        if future is None:
+            return None
+        if registration.executor != PROCESS_EXECUTOR:
+            return future.result()
+        try:
+            future.result()
+        except NotNowException:
+            raise
+        except Exception:  # pylint: disable=broad-except
+            exc_info = sys.exc_info()
+            self._report_handler_exception(registration, exc_info)
+            return exc_info
+        return None
 
-    def _call_registration(self, registration, kwargs):
-        if registration.is_being_called() and not registration.reentrant:
+    async def trigger_async(self, kwargs, tags=None):
+        """Triggers the hook from within an asyncio event loop, awaiting handlers that return awaitables. Handlers that do
+        not depend on each other through needs/provides run concurrently, in call order within each dependency level
+        """
+        if not self._registrations and not self.group.is_strict():
+            return
+        plan, registrations = self._prepare_trigger(tags)
+        if plan is None:
+            return
+        self.validate_kwargs(kwargs)
+        if not registrations:
             return
+        exception_policy = self.group.get_exception_policy()
+        with exception_policy.context() as ctx:
+            if not plan.has_batch_handlers:
+                await self._dispatch_async(plan, registrations, kwargs, exception_policy, ctx)
+                return
+            call_registration = self._get_call_registration(plan, is_async=True)
+            with self._observe_trigger(plan, kwargs) if plan.is_observed else nullcontext():
+                await self._dispatch_async(plan, [registration for registration in registrations if not registration.batch],
+                                           kwargs, exception_policy, ctx, call_registration)
+                await self._dispatch_async(plan, [registration for registration in registrations if registration.batch],
+                                           {'events': [kwargs]}, exception_policy, ctx, call_registration)
+
+    async def _dispatch_async(self, plan, registrations, kwargs, exception_policy, ctx, call_registration=None):
+        if call_registration is None:
+            if plan.is_observed:
+                await self._dispatch_async_observed(plan, registrations, kwargs, exception_policy, ctx)
+                return
+            call_registration = self._call_registration_async
+        pre_trigger_callbacks = plan.pre_trigger_callbacks
+        deferred = []
+
+        while True:
+            any_resolved = False
+            for level in plan.group_by_level(registrations):
+                level = [registration for registration in level if registration.is_active()]
+                results = await asyncio.gather(
+                    *[call_registration(registration, kwargs, pre_trigger_callbacks) for registration in level],
+                    return_exceptions=True)
+                for registration, result in zip(level, results):
+                    if isinstance(result, NotNowException):
+                        deferred.append(registration)
+                        continue
+                    if isinstance(result, BaseException):
+                        raise result
+                    any_resolved = True
+                    if result is not None:
+                        exception_policy.handle_exception(ctx, result)
+            if deferred:
+                if not any_resolved:
+                    raise CannotResolveDependencies(
+                        "Cannot resolve handler dependencies for {0}".format(self))
+                registrations = deferred
+                deferred = []
+            else:
+                break
+
+    async def _dispatch_async_observed(self, plan, registrations, kwargs, exception_policy, ctx):
+        with self._observe_trigger(plan, kwargs):
+            await self._dispatch_async(plan, registrations, kwargs, exception_policy, ctx,
+                                       self._get_call_registration(plan, is_async=True))
+
+    async def _call_registration_async_observed(self, post_trigger_callbacks, registration, kwargs, pre_trigger_callbacks=()):
+        if not registration.reentrant and registration.is_being_called():
+            return None
+        started = perf_counter()
+        exc_info = await self._call_registration_async(registration, kwargs, pre_trigger_callbacks)
+        elapsed = perf_counter() - started
+        for callback in post_trigger_callbacks:
+            callback(registration, kwargs, elapsed, exc_info)
+        return exc_info
+
+    async def _call_registration_async(self, registration, kwargs, pre_trigger_callbacks=()):
+        if not registration.reentrant and registration.is_being_called():
+            return None
         exc_info = None
-        for callback in self._pre_trigger_callbacks:
+        for callback in pre_trigger_callbacks:
+            callback(registration, kwargs)
+        try:
+            if registration.executor == PROCESS_EXECUTOR:
+                future = registration.submit_to(get_process_pool(), **kwargs)
+                if future is not None:
+                    await asyncio.wrap_future(future)
+            else:
+                await registration.call_async(**kwargs)
+        except NotNowException:
+            raise
+        except Exception:  # pylint: disable=broad-except
+            exc_info = sys.exc_info()
+            self._report_handler_exception(registration, exc_info)
+        return exc_info
+
+    def _call_registration(self, registration, kwargs, pre_trigger_callbacks=()):
+        if not registration.reentrant and registration.is_being_called():
+            return
+        exc_info = None
+        for callback in pre_trigger_callbacks:
             callback(registration, kwargs)
         try:
             registration(**kwargs)
@@ -261,12 +774,25 @@ class Hook():
             raise
         except Exception:  # pylint: disable=broad-except
             exc_info = sys.exc_info()
-            if self._trigger_internal_hooks:
-                trigger("gossip.on_handler_exception",
-                        handler=registration.func, exception=exc_info, hook=self)
-            _logger.debug("Exception occurred while calling {0}", registration, exc_info=exc_info)
+            self._report_handler_exception(registration, exc_info)
+        return exc_info
+
+    def _call_registration_observed(self, post_trigger_callbacks, registration, kwargs, pre_trigger_callbacks=()):
+        if not registration.reentrant and registration.is_being_called():
+            return None
+        started = perf_counter()
+        exc_info = self._call_registration(registration, kwargs, pre_trigger_callbacks)
+        elapsed = perf_counter() - started
+        for callback in post_trigger_callbacks:
+            callback(registration, kwargs, elapsed, exc_info)
         return exc_info
 
+    def _report_handler_exception(self, registration, exc_info):
+        if self._trigger_internal_hooks:
+            trigger("gossip.on_handler_exception",
+                    handler=registration.func, exception=exc_info, hook=self)
+        _logger.debug("Exception occurred while calling {0}", registration, exc_info=exc_info)
+
     def __repr__(self):
         return "<Hook {0}({1})>".format(self.name, ", ".join(self._arguments or ()))
 
@@ -274,7 +800,9 @@ class Hook():
 def trigger(hook_name, **kwargs):
     """Triggers a hook by name, causing all of its handlers to be called
     """
-    trigger_with_tags(hook_name, kwargs, None)
+    hook = registry.hooks.get(hook_name)
+    if hook is not None and (hook._registrations or hook.group.is_strict()):  # pylint: disable=protected-access
+        hook.trigger(kwargs)
 
 
 def trigger_with_tags(hook_name, kwargs=None, tags=None):
@@ -283,15 +811,39 @@ def trigger_with_tags(hook_name, kwargs=None, tags=None):
     direct keyword arguments
     """
     hook = registry.hooks.get(hook_name)
-    if hook is not None:
+    if hook is not None and (hook._registrations or hook.group.is_strict()):  # pylint: disable=protected-access
         hook.trigger(kwargs or {}, tags)
 
 
+def trigger_many(hook_name, kwargs_iterable):
+    """Triggers a hook by name once for each dictionary of keyword arguments in ``kwargs_iterable``.
+
+    .. seealso:: :meth:`gossip.hooks.Hook.trigger_many`
+    """
+    hook = registry.hooks.get(hook_name)
+    if hook is not None and (hook._registrations or hook.group.is_strict()):  # pylint: disable=protected-access
+        hook.trigger_many(kwargs_iterable)
+
+
+async def trigger_async(hook_name, **kwargs):
+    """Triggers a hook by name from within an asyncio event loop, awaiting coroutine handlers.
+
+    .. seealso:: :meth:`gossip.hooks.Hook.trigger_async`
+    """
+    hook = registry.hooks.get(hook_name)
+    if hook is not None and (hook._registrations or hook.group.is_strict()):  # pylint: disable=protected-access
+        await hook.trigger_async(kwargs)
+
+
 def get_or_create_hook(hook_name, **kwargs):
-    try:
-        return get_hook(hook_name)
-    except HookNotFound:
-        return create_hook(hook_name, **kwargs)
+    returned = registry.hooks.get(hook_name)
+    if returned is not None:
+        return returned
+    with registry.lock:
+        try:
+            return get_hook(hook_name)
+        except HookNotFound:
+            return create_hook(hook_name, **kwargs)
 
 
 def get_hook(hook_name):
@@ -311,6 +863,11 @@ def create_hook(hook_name, **kwargs):
     if not isinstance(hook_name, str):
         raise IllegalHookName("Hook name must be string (got: {})".format(hook_name))
 
+    with registry.lock:
+        return _create_hook(hook_name, **kwargs)
+
+
+def _create_hook(hook_name, **kwargs):
     if hook_name in registry.hooks:
         raise NameAlreadyUsed(
             "A hook named {0} already exists. Cannot create a hook with the same name".format(hook_name))
@@ -340,19 +897,20 @@ def define(hook_name, **kwargs):
     :returns: The :class:`gossip.hook.Hook` object created
     """
     tags = kwargs.pop('tags', None)
-    returned = get_or_create_hook(hook_name)
-    if returned.is_defined():
-        raise NameAlreadyUsed("Hook {0} is already defined".format(hook_name))
-    if kwargs:
-        returned.configure(**kwargs)
-    if tags:
-        returned.set_tags(tags)
-    returned.mark_defined()
+    with registry.lock:
+        returned = get_or_create_hook(hook_name)
+        if returned.is_defined():
+            raise NameAlreadyUsed("Hook {0} is already defined".format(hook_name))
+        if kwargs:
+            returned.configure(**kwargs)
+        if tags:
+            returned.set_tags(tags)
+        returned.mark_defined()
     return returned
 
 
 def register(func=None, hook_name=None, token=None, tags=None, needs=None, provides=None, reentrant=True,
-             toggles_on=None, toggles_off=None, priority=0, guard=None):
+             toggles_on=None, toggles_off=None, priority=0, guard=None, executor=None, batch=False):
     """Registers a new function to a hook
 
     :param hook_name: full name of hook to register to
@@ -363,6 +921,11 @@ def register(func=None, hook_name=None, token=None, tags=None, needs=None, provi
     :param reentrent: specifies whether this hook can reenter (i.e. be called in recursion)
     :param toggles_on: specifies a toggle object to turn on when calling this registration. The registration will not be called if the toggle isn't off
     :param toggles_off: specifies a toggle object to turn off when calling this registration. The registration will not be called if the toggle isn't on
+    :param executor: pass ``"process"`` to call the handler in a managed process pool (see :mod:`gossip.process_pool`),
+           for CPU-bound handlers. The handler and the hook's arguments must be picklable
+    :param batch: if True, the handler is called once per batch of events (see :meth:`gossip.hooks.Hook.trigger_many`),
+           receiving the list of keyword argument dictionaries as its ``events`` argument, after the other handlers.
+           Batch handlers cannot specify ``needs`` or ``provides``
     :returns: The function (for decorator chaining)
 
     """
@@ -384,13 +947,15 @@ def register(func=None, hook_name=None, token=None, tags=None, needs=None, provi
             toggles_off=toggles_off,
             priority=priority,
             guard=guard,
+            executor=executor,
+            batch=batch,
         )
     assert hook_name is not None
     registration = get_or_create_hook(
         hook_name).register(
             func, token=token, tags=tags, needs=needs, provides=provides, reentrant=reentrant,
             toggles_on=toggles_on, toggles_off=toggles_off,
-            priority=priority, guard=guard,
+            priority=priority, guard=guard, executor=executor, batch=batch,
         )
     assert registration
     return func
@@ -424,42 +989,10 @@ def registered(hook_name, func, **kwargs):
 
 
 def get_all_hooks():
-    return list(itervalues(registry.hooks))
+    with registry.lock:
+        return list(itervalues(registry.hooks))
 
 
 def get_all_registrations():
     return [reg for hook in get_all_hooks()
             for reg in hook.get_registrations()]
-
-
-def _can_be_muted(hook_name):
-    try:
-        hook = get_hook(hook_name)
-    except HookNotFound:
-        return True
-    return hook.can_be_muted()
-
-
-_muted_stack = [set()]
-
-
-@contextmanager
-def mute_context(hook_names):
-    """A context manager, during the execution of which the specified hook names will be ignored. Any code that tries to
-    trigger these hooks will trigger no callback.
-
-    :type hook_names: list, tuple or generator of full hook names to mute
-    """
-    if not isinstance(hook_names, (list, tuple, GeneratorType)):
-        raise TypeError('hook names to mute must be a list or a tuple')
-    cannot_be_muted = [hook_name for hook_name in set(hook_names) if not _can_be_muted(hook_name)]
-    if cannot_be_muted:
-        msg = 'Muting is forbidden for {} {}'.format(
-            'the hook' if len(cannot_be_muted) == 1 else 'hooks',
-            ', '.join("'{}'".format(hook_name) for hook_name in cannot_be_muted))
-        raise CannotMuteHooks(msg)
-    _muted_stack.append(_muted_stack[-1] | set(hook_names))
-    try:
-        yield
-    finally:
-        _muted_stack.pop(-1)
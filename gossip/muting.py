@@ -0,0 +1,84 @@
+"""Muting hooks and groups in the current context, see :func:`gossip.mute_context`
+"""
+import contextvars
+from contextlib import contextmanager
+from types import GeneratorType
+
+from . import registry
+from ._compat import string_types
+from .exceptions import CannotMuteHooks
+
+# a context variable per hook name and per group name, set to True while it is muted in the current thread or asyncio
+# task
+_hook_mute_vars = {}
+_group_mute_vars = {}
+# the number of mute contexts muting groups in the current context, sparing triggers from checking parent groups when
+# it is zero
+num_muted_groups = contextvars.ContextVar('gossip_num_muted_groups', default=0)
+
+
+def get_hook_mute_var(hook_name):
+    return _get_mute_var(_hook_mute_vars, 'gossip_muted_', hook_name)
+
+
+def get_group_mute_var(group_name):
+    return _get_mute_var(_group_mute_vars, 'gossip_muted_group_', group_name)
+
+
+def _get_mute_var(mute_vars, prefix, name):
+    returned = mute_vars.get(name)
+    if returned is None:
+        with registry.lock:
+            returned = mute_vars.get(name)
+            if returned is None:
+                returned = mute_vars[name] = contextvars.ContextVar(prefix + str(name), default=False)
+    return returned
+
+
+def _can_be_muted(hook_name):
+    hook = registry.hooks.get(hook_name)
+    return hook is None or hook.can_be_muted()
+
+
+def _can_group_be_muted(group_name):
+    group = registry.groups.get(group_name)
+    return group is None or group.can_be_muted()
+
+
+@contextmanager
+def mute_context(hook_names=(), groups=()):
+    """A context manager, during the execution of which the specified hook names will be ignored. Any code that tries to
+    trigger these hooks will trigger no callback. Muting only applies to the current thread or asyncio task (and tasks
+    created within the context).
+
+    :type hook_names: list, tuple or generator of full hook names to mute
+    :param groups: list, tuple or generator of groups (or full group names) to mute, along with all of their subgroups.
+           Hooks in these groups that forbid muting are still triggered
+    """
+    if not isinstance(hook_names, (list, tuple, GeneratorType)):
+        raise TypeError('hook names to mute must be a list or a tuple')
+    if not isinstance(groups, (list, tuple, GeneratorType)):
+        raise TypeError('groups to mute must be a list or a tuple')
+    hook_names = set(hook_names)
+    group_names = set(group if isinstance(group, string_types) else group.full_name for group in groups)
+    cannot_be_muted = [hook_name for hook_name in hook_names if not _can_be_muted(hook_name)]
+    if cannot_be_muted:
+        msg = 'Muting is forbidden for {} {}'.format(
+            'the hook' if len(cannot_be_muted) == 1 else 'hooks',
+            ', '.join("'{}'".format(hook_name) for hook_name in cannot_be_muted))
+        raise CannotMuteHooks(msg)
+    cannot_be_muted = [group_name for group_name in group_names if not _can_group_be_muted(group_name)]
+    if cannot_be_muted:
+        msg = 'Muting is forbidden for {} {}'.format(
+            'the group' if len(cannot_be_muted) == 1 else 'groups',
+            ', '.join("'{}'".format(group_name) for group_name in cannot_be_muted))
+        raise CannotMuteHooks(msg)
+    tokens = [(mute_var, mute_var.set(True)) for mute_var in map(get_hook_mute_var, hook_names)]
+    tokens.extend((mute_var, mute_var.set(True)) for mute_var in map(get_group_mute_var, group_names))
+    if group_names:
+        tokens.append((num_muted_groups, num_muted_groups.set(num_muted_groups.get() + 1)))
+    try:
+        yield
+    finally:
+        for mute_var, token in reversed(tokens):
+            mute_var.reset(token)
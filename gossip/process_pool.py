@@ -0,0 +1,44 @@
+"""The process pool used to call handlers registered with ``executor="process"``
+"""
+import atexit
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+_pool = None
+_max_workers = None
+_lock = threading.Lock()
+
+
+def get_process_pool():
+    """Returns the managed process pool, creating it on first use
+    """
+    global _pool  # pylint: disable=global-statement
+    pool = _pool
+    if pool is None:
+        with _lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(max_workers=_max_workers)
+            pool = _pool
+    return pool
+
+
+def set_process_pool_size(max_workers):
+    """Sets the number of worker processes (defaults to the number of CPUs). Takes effect the next time the pool is created
+    """
+    global _max_workers  # pylint: disable=global-statement
+    with _lock:
+        _max_workers = max_workers
+    shutdown_process_pool()
+
+
+def shutdown_process_pool(wait=True):
+    """Shuts down the managed process pool. A new pool is created if process handlers are triggered again
+    """
+    global _pool  # pylint: disable=global-statement
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait)
+
+
+atexit.register(shutdown_process_pool)
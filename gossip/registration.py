@@ -1,7 +1,11 @@
+import contextvars
+import inspect
 import itertools
 import sys
 import types
+import weakref
 
+from . import registry
 from ._compat import string_types
 
 PY26 = sys.version_info < (2, 7)
@@ -10,15 +14,33 @@ _registration_id = itertools.count()
 
 _token_registrations = {}
 
+_EMPTY_FROZENSET = frozenset()
+
+PROCESS_EXECUTOR = 'process'
+
+# registrations tend to share the same few tag and dependency sets, so equal sets are stored only once. Sets are
+# only kept while some registration refers to them, so handlers with ever-changing tags don't leak memory
+_interned_frozensets = weakref.WeakValueDictionary()
+
+# the non-reentrant registrations being called in the current context (thread or asyncio task). Reentrant
+# registrations are not tracked, so calling them costs nothing extra
+_active_calls = contextvars.ContextVar('gossip_active_calls', default=_EMPTY_FROZENSET)
+
 
 class Registration():
 
+    __slots__ = ('id', 'hook', 'func', 'token', 'needs', 'provides', 'reentrant', 'tags', 'valid',
+                 '_toggles_on', '_toggles_off', '_priority', '_guard', 'executor', 'batch')
+
     def __init__(self, func, hook, token=None, tags=None, needs=None, provides=None, reentrant=True, toggles_on=None,
-                 toggles_off=None, priority=0, guard=None):
+                 toggles_off=None, priority=0, guard=None, executor=None, batch=False):
         super().__init__()
 
         assert not (toggles_off is not None and toggles_on is not None), 'Cannot specify both toggles_on and toggles_off'
         assert (guard is None) or callable(guard), "Registration 'guard' argument must be callable if specified"
+        assert executor in (None, PROCESS_EXECUTOR), "Registration 'executor' argument must be None or {0!r}".format(
+            PROCESS_EXECUTOR)
+        assert not (batch and (needs or provides)), "Registration 'batch' handlers cannot specify needs or provides"
         self.id = next(_registration_id)
         self.hook = hook
         self.func = func
@@ -26,9 +48,9 @@ class Registration():
         self.needs = _normalize_deps(needs)
         self.provides = _normalize_deps(provides)
         self.reentrant = reentrant
-        self._is_being_called = False
-        self.tags = set(tags) if tags else None
-        if not isinstance(func, (classmethod, staticmethod, types.MethodType)) and not hasattr(func, "gossip"):
+        self.tags = _intern_frozenset(tags) if tags else None
+        # process handlers are pickled along with their attributes, and a registration cannot be pickled
+        if executor != PROCESS_EXECUTOR and not isinstance(func, (classmethod, staticmethod, types.MethodType)) and not hasattr(func, "gossip"):
             func.gossip = self
 
         self.valid = True
@@ -36,6 +58,8 @@ class Registration():
         self._toggles_off = toggles_off
         self._priority = priority
         self._guard = guard
+        self.executor = executor
+        self.batch = batch
 
     def get_priority(self):
         return self._priority
@@ -53,9 +77,10 @@ class Registration():
         return bool(set(tags) & self.tags)
 
     def unregister(self):
-        if self.hook is not None:
-            self.hook.unregister(self)
-            assert self.hook is None
+        with registry.lock:
+            if self.hook is not None:
+                self.hook.unregister(self)
+                assert self.hook is None
 
     def is_active(self):
         if (self.hook is None) or (not self.valid):
@@ -65,7 +90,10 @@ class Registration():
         return self._guard()
 
     def is_being_called(self):
-        return self._is_being_called
+        """Returns whether this registration is being called in the current thread or asyncio task. Only tracked for
+        non-reentrant registrations
+        """
+        return self in _active_calls.get()
 
     def can_be_called(self):
         return True
@@ -76,12 +104,41 @@ class Registration():
         if not self._check_toggle():
             return
 
-        prev = self._is_being_called
+        if self.reentrant:
+            return self.func(*args, **kwargs)
+        token = _active_calls.set(_active_calls.get() | {self})
         try:
-            self._is_being_called = True
             return self.func(*args, **kwargs)
         finally:
-            self._is_being_called = prev
+            _active_calls.reset(token)
+
+    async def call_async(self, *args, **kwargs):
+        """Calls the registration, awaiting its result if the handler returned an awaitable (e.g. a coroutine)
+        """
+        assert self.valid
+
+        if not self._check_toggle():
+            return None
+
+        token = None if self.reentrant else _active_calls.set(_active_calls.get() | {self})
+        try:
+            returned = self.func(*args, **kwargs)
+            if inspect.isawaitable(returned):
+                returned = await returned
+            return returned
+        finally:
+            if token is not None:
+                _active_calls.reset(token)
+
+    def submit_to(self, executor, **kwargs):
+        """Submits the handler to ``executor`` (e.g. a process pool), returning the resulting future, or ``None`` if
+        the registration's toggle prevents it from being called
+        """
+        assert self.valid
+
+        if not self._check_toggle():
+            return None
+        return executor.submit(self.func, **kwargs)
 
     def _check_toggle(self):
 
@@ -97,13 +154,68 @@ class Registration():
 
         return True
 
+    def get_qualified_name(self):
+        """Returns the qualified name of the registered function, including its module
+        """
+        qualname = getattr(self.func, '__qualname__', None)
+        if qualname is None:
+            return repr(self.func)
+        return '{0}.{1}'.format(self.func.__module__, qualname)
+
     def __repr__(self):
         return "<{}: {}>".format(self.__class__.__name__, self.func)
 
 
+def is_indexed_token(token):
+    """Returns whether registrations made with ``token`` are indexed by it. Registrations made without a token, or with
+    an unhashable one, are not
+    """
+    if token is None:
+        return False
+    try:
+        hash(token)
+    except TypeError:
+        return False
+    return True
+
+
+def _index_token(registration):
+    if is_indexed_token(registration.token):
+        _token_registrations.setdefault(registration.token, {})[registration] = None
+
+
+def _unindex_token(registration):
+    if not is_indexed_token(registration.token):
+        return
+    registrations = _token_registrations.get(registration.token)
+    if registrations is not None:
+        registrations.pop(registration, None)
+        if not registrations:
+            del _token_registrations[registration.token]
+
+
+def get_token_registrations(token):
+    """Returns the live registrations made with ``token``, in registration order. Only indexed tokens are tracked (see
+    :func:`is_indexed_token`), so none are returned for other tokens
+    """
+    if not is_indexed_token(token):
+        return []
+    with registry.lock:
+        return list(_token_registrations.get(token, ()))
+
+
+def _intern_frozenset(items):
+    items = frozenset(items)
+    interned = _interned_frozensets.get(items)
+    if interned is None:
+        # the dictionary references its keys strongly, so it is keyed by a copy of the interned set
+        interned = _interned_frozensets.setdefault(items.union(), items)
+    return interned
+
+
 def _normalize_deps(deps):
     if not deps:
-        deps = ()
+        return _EMPTY_FROZENSET
     if isinstance(deps, string_types):
         deps = [deps]
-    return frozenset(deps)
+    return _intern_frozenset(deps)
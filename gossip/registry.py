@@ -1,3 +1,9 @@
+import threading
+
 groups = {}
 
 hooks = {}
+
+# Guards every mutation of the registry (hooks, groups and registrations). Triggers do not take it: they call the
+# handlers of immutable dispatch plans, which are rebuilt under the lock after each change
+lock = threading.RLock()
@@ -0,0 +1,150 @@
+"""Opt-in timing statistics of hook triggers and handler calls.
+
+When statistics are disabled (the default) triggers take the regular, uninstrumented dispatch path
+"""
+import math
+import threading
+from collections import deque, namedtuple
+
+from . import registry
+
+# percentiles are computed over the most recent calls
+MAX_SAMPLES = 1024
+
+Stats = namedtuple('Stats', ['count', 'total_time', 'mean_time', 'p50', 'p99', 'exceptions'])
+HookStats = namedtuple('HookStats', Stats._fields + ('handlers',))
+
+_enabled = False
+_recorders = {}
+_lock = threading.Lock()
+
+
+class _Timings():
+
+    __slots__ = ('count', 'total_time', 'exceptions', 'samples')
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+        self.total_time = 0.0
+        self.exceptions = 0
+        self.samples = deque(maxlen=MAX_SAMPLES)
+
+    def add(self, elapsed, failed):
+        self.count += 1
+        self.total_time += elapsed
+        self.samples.append(elapsed)
+        if failed:
+            self.exceptions += 1
+
+    def to_stats(self):
+        samples = sorted(self.samples)
+        return Stats(count=self.count, total_time=self.total_time,
+                     mean_time=self.total_time / self.count if self.count else 0.0,
+                     p50=_get_percentile(samples, 0.5), p99=_get_percentile(samples, 0.99),
+                     exceptions=self.exceptions)
+
+
+def _get_percentile(sorted_samples, fraction):
+    if not sorted_samples:
+        return 0.0
+    return sorted_samples[max(0, int(math.ceil(fraction * len(sorted_samples))) - 1)]
+
+
+class HookRecorder():
+    """Records the timings of a single hook's triggers and handlers, through the hook's trigger end and post-trigger
+    callbacks
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._triggers = _Timings()
+        self._handlers = {}
+
+    def record_trigger(self, hook, kwargs, elapsed, exc_info):  # pylint: disable=unused-argument
+        with _lock:
+            self._triggers.add(elapsed, failed=False)
+
+    def record_handler(self, registration, kwargs, elapsed, exc_info):  # pylint: disable=unused-argument
+        failed = exc_info is not None
+        with _lock:
+            timings = self._handlers.get(registration)
+            if timings is None:
+                timings = self._handlers[registration] = _Timings()
+            timings.add(elapsed, failed)
+            if failed:
+                self._triggers.exceptions += 1
+
+    def reset(self):
+        with _lock:
+            self._triggers = _Timings()
+            self._handlers = {}
+
+    def to_stats(self):
+        with _lock:
+            return HookStats(*self._triggers.to_stats(), handlers={
+                registration: timings.to_stats() for registration, timings in self._handlers.items()})
+
+
+def enable():
+    """Starts recording statistics for all hooks
+    """
+    _set_enabled(True)
+
+
+def disable():
+    """Stops recording statistics. Statistics recorded so far are kept until :func:`reset` is called
+    """
+    _set_enabled(False)
+
+
+def is_enabled():
+    return _enabled
+
+
+def _set_enabled(enabled):
+    global _enabled  # pylint: disable=global-statement
+    with registry.lock:
+        _enabled = enabled
+        for hook in registry.hooks.values():
+            hook._invalidate_dispatch_plan()  # pylint: disable=protected-access
+
+
+def get_recorder(hook):
+    """Returns the recorder of ``hook``, or ``None`` if statistics are disabled
+    """
+    if not _enabled:
+        return None
+    with _lock:
+        returned = _recorders.get(hook.full_name)
+        if returned is None:
+            returned = _recorders[hook.full_name] = HookRecorder()
+    return returned
+
+
+def discard_recorder(hook):
+    """Drops the statistics recorded for ``hook``, once it is undefined or all of its handlers are unregistered
+    """
+    with _lock:
+        _recorders.pop(hook.full_name, None)
+
+
+def reset():
+    """Clears the statistics recorded so far
+    """
+    with _lock:
+        recorders = list(_recorders.values())
+    for recorder in recorders:
+        recorder.reset()
+
+
+def get_stats():
+    """Returns the statistics recorded for each hook (by full name) as a :class:`HookStats`, whose ``handlers`` map each
+    registration to its :class:`Stats`. Times are in seconds. Triggers of a hook are timed from the first handler call
+    to the last; handlers called in the process pool are not timed.
+
+    .. seealso:: :func:`enable`
+    """
+    with _lock:
+        recorders = list(_recorders.items())
+    return {hook_name: recorder.to_stats() for hook_name, recorder in recorders}
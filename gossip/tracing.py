@@ -0,0 +1,120 @@
+"""Recording hook triggers and handler calls as a timeline, exported in the Chrome trace event format (which can be
+viewed in Perfetto or ``chrome://tracing``).
+
+When tracing is disabled (the default) triggers take the regular, untraced dispatch path
+"""
+import json
+import os
+import threading
+from collections import deque
+from time import perf_counter
+
+from . import registry
+
+DEFAULT_MAX_EVENTS = 100000
+
+_tracer = None
+
+
+class Tracer():
+    """Records a trace event for every trigger and handler call of the traced hooks, keeping the most recent
+    ``max_events`` events
+    """
+
+    def __init__(self, max_events=DEFAULT_MAX_EVENTS):
+        super().__init__()
+        if max_events < 1:
+            raise ValueError("max_events must be positive (got: {0!r})".format(max_events))
+        self._events = deque(maxlen=max_events)
+        self._thread_names = {}
+        self._lock = threading.Lock()
+
+    def record_trigger(self, hook, kwargs, elapsed, exc_info):  # pylint: disable=unused-argument
+        self._record(hook.full_name, 'trigger', elapsed, exc_info, {})
+
+    def record_handler(self, registration, kwargs, elapsed, exc_info):  # pylint: disable=unused-argument
+        self._record(registration.get_qualified_name(), 'handler', elapsed, exc_info,
+                     {'hook': registration.hook.full_name if registration.hook is not None else None})
+
+    def _record(self, name, category, elapsed, exc_info, args):
+        end = perf_counter()
+        thread = threading.current_thread()
+        if exc_info is not None:
+            args['exception'] = repr(exc_info[1])
+        with self._lock:
+            self._events.append((name, category, end - elapsed, elapsed, thread.ident, args))
+            self._thread_names[thread.ident] = thread.name
+
+    def clear(self):
+        with self._lock:
+            self._events.clear()
+            self._thread_names.clear()
+
+    def get_events(self):
+        """Returns the recorded events as a list of Chrome trace events (dictionaries). Each trigger and handler call is
+        a complete (``X``) event, so nested triggers appear nested under the handlers triggering them
+        """
+        pid = os.getpid()
+        with self._lock:
+            events = list(self._events)
+            thread_names = dict(self._thread_names)
+        returned = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': thread_name}}
+                    for tid, thread_name in thread_names.items()]
+        returned.extend({'name': name, 'cat': category, 'ph': 'X', 'ts': start * 1e6, 'dur': elapsed * 1e6,
+                         'pid': pid, 'tid': tid, 'args': args}
+                        for name, category, start, elapsed, tid, args in events)
+        return returned
+
+    def export(self, path_or_file):
+        """Writes the recorded events as Chrome trace JSON to ``path_or_file`` (a path or a writable text file)
+        """
+        trace = {'traceEvents': self.get_events(), 'displayTimeUnit': 'ms'}
+        if hasattr(path_or_file, 'write'):
+            json.dump(trace, path_or_file)
+            return
+        with open(path_or_file, 'w', encoding='utf-8') as f:
+            json.dump(trace, f)
+
+
+def enable(max_events=DEFAULT_MAX_EVENTS):
+    """Starts tracing all hooks into a new ring buffer holding the most recent ``max_events`` events, returning its
+    :class:`Tracer`
+    """
+    tracer = Tracer(max_events)
+    _set_tracer(tracer)
+    return tracer
+
+
+def disable():
+    """Stops tracing, returning the :class:`Tracer` holding the events recorded so far (or ``None`` if tracing was not
+    enabled)
+    """
+    returned = _tracer
+    _set_tracer(None)
+    return returned
+
+
+def is_enabled():
+    return _tracer is not None
+
+
+def get_tracer():
+    """Returns the active :class:`Tracer`, or ``None`` if tracing is disabled
+    """
+    return _tracer
+
+
+def _set_tracer(tracer):
+    global _tracer  # pylint: disable=global-statement
+    with registry.lock:
+        _tracer = tracer
+        for hook in registry.hooks.values():
+            hook._invalidate_dispatch_plan()  # pylint: disable=protected-access
+
+
+def export(path_or_file):
+    """Writes the events recorded by the active tracer as Chrome trace JSON, see :meth:`Tracer.export`
+    """
+    if _tracer is None:
+        raise RuntimeError("Tracing is not enabled")
+    _tracer.export(path_or_file)
@@ -5,33 +5,128 @@ from .helpers import DONT_CARE, FIRST
 
 def topological_sort_registrations(registrations, unconstrained_priority=DONT_CARE):
     graph = _build_dependency_graph(registrations, unconstrained_priority=unconstrained_priority)
-    returned_indices = _topological_sort(range(len(registrations)), graph)
-    assert len(returned_indices) == len(registrations)
-    return [registrations[idx] for idx in returned_indices]
+    barrier_index = len(registrations)
+    returned_indices = _topological_sort(range(barrier_index + 1), graph)
+    assert len(returned_indices) == len(registrations) + 1
+    return [registrations[idx] for idx in returned_indices if idx != barrier_index]
+
+
+def insert_by_priority(registrations, registration, unconstrained_priority, num_constrained, is_priority_sorted):
+    """Inserts a registration before the first registration with a lower priority, within the part of the call order
+    where ``unconstrained_priority`` puts it, given the number of registrations with needs/provides. Returns the index
+    it was inserted at
+    """
+    is_constrained = bool(registration.needs or registration.provides)
+    low, high = 0, len(registrations)
+    if unconstrained_priority != DONT_CARE and (is_constrained or num_constrained):
+        # with FIRST/LAST, unconstrained handlers are kept before/after all constrained ones
+        constrained_positions = [index for index, other in enumerate(registrations) if other.needs or other.provides]
+        if unconstrained_priority == FIRST:
+            boundary = constrained_positions[0] if constrained_positions else high
+            low, high = (boundary, high) if is_constrained else (low, boundary)
+        else:
+            boundary = constrained_positions[-1] + 1 if constrained_positions else low
+            low, high = (low, boundary) if is_constrained else (boundary, high)
+    index = _get_priority_position(registrations, registration.priority, low, high, is_priority_sorted)
+    registrations.insert(index, registration)
+    return index
+
+
+def _get_priority_position(registrations, priority, low, high, is_priority_sorted):
+    if not is_priority_sorted:
+        return next((index for index in range(low, high) if registrations[index].priority < priority), high)
+    if low == high or registrations[high - 1].priority >= priority:
+        return high
+    while low < high:
+        middle = (low + high) // 2
+        if registrations[middle].priority < priority:
+            high = middle
+        else:
+            low = middle + 1
+    return low
+
+
+def is_sorted_by_priority(registrations):
+    return all(registrations[index].priority >= registrations[index + 1].priority
+               for index in range(len(registrations) - 1))
+
+
+def sort_dependency_components(registrations, new_registrations):
+    """Restores the call order after ``new_registrations`` were inserted into an otherwise valid call order. If they
+    break it, only the registrations connected to them (directly or indirectly) through needs/provides are re-sorted,
+    within the positions they already occupy. Returns whether the order changed
+    """
+    needed = set()
+    for registration in registrations:
+        # a registration providing what it needs itself forms a cycle, which the sort reports
+        needed.update(registration.needs)
+        if registration.provides & needed:
+            break
+    else:
+        return False
+    providers_by_name = {}
+    needers_by_name = {}
+    for registration in registrations:
+        for name in registration.provides:
+            providers_by_name.setdefault(name, []).append(registration)
+        for name in registration.needs:
+            needers_by_name.setdefault(name, []).append(registration)
+    component = set(new_registrations)
+    to_visit = list(new_registrations)
+    while to_visit:
+        current = to_visit.pop()
+        neighbours = [providers_by_name.get(name, ()) for name in current.needs]
+        neighbours.extend(needers_by_name.get(name, ()) for name in current.provides)
+        for neighbour in itertools.chain.from_iterable(neighbours):
+            if neighbour not in component:
+                component.add(neighbour)
+                to_visit.append(neighbour)
+    positions = [index for index, registration in enumerate(registrations) if registration in component]
+    sorted_members = topological_sort_registrations([registrations[index] for index in positions])
+    for index, registration in zip(positions, sorted_members):
+        registrations[index] = registration
+    return True
+
+
+def get_dependency_levels(registrations, unconstrained_priority=DONT_CARE):
+    """Returns the dependency level of each registration: registrations on the same level do not depend on each
+    other (directly or indirectly), and all of a registration's dependencies are on lower levels
+    """
+    graph = _build_dependency_graph(registrations, unconstrained_priority=unconstrained_priority)
+    barrier_index = len(registrations)
+    successors = [[] for _ in range(barrier_index + 1)]
+    for n, m in graph:
+        successors[n].append(m)
+    levels = [0] * (barrier_index + 1)
+    for n in _topological_sort(range(barrier_index + 1), graph):
+        for m in successors[n]:
+            levels[m] = max(levels[m], levels[n] + 1)
+    # the barrier node occupies a level of its own, which ends up empty once it is dropped
+    return levels[:barrier_index]
 
 
 def _topological_sort(indices, graph):
-    independent = sorted(set(indices) - set(m for n, m in graph), reverse=True)
+    predecessors = dict((index, []) for index in indices)
+    for n, m in graph:
+        predecessors[m].append(n)
+    # successors are listed in the order of ``indices``, so nodes freed by the same node are handled in index order
+    successors = dict((index, []) for index in indices)
+    in_degrees = {}
+    for m in indices:
+        in_degrees[m] = len(predecessors[m])
+        for n in predecessors[m]:
+            successors[n].append(m)
+
+    independent = sorted((index for index in indices if not in_degrees[index]), reverse=True)
     returned = []
     while independent:
         n = independent.pop()
         returned.append(n)
-        for m in indices:
-            edge = (n, m)
-            if m == n:
-                assert edge not in graph
-                continue
-            if edge in graph:
-                graph.remove(edge)
-                # check if m is now independent
-                for edge in graph:
-                    if edge[1] == m:
-                        # not indepdendent
-                        break
-                else:
-                    # no other incoming edges to m
-                    independent.append(m)
-    if graph:
+        for m in successors[n]:
+            in_degrees[m] -= 1
+            if not in_degrees[m]:
+                independent.append(m)
+    if len(returned) != len(in_degrees):
         raise CannotResolveDependencies('Cyclic dependency detected')
     return returned
 
@@ -51,16 +146,19 @@ def _build_dependency_graph(registrations, unconstrained_priority):
             for provider_index in providers_by_name.get(need, []):
                 graph.add((provider_index, needer_index))
 
-
     if unconstrained_priority != DONT_CARE:
-        caring_indices = set([idx for idx, r in enumerate(registrations) if r.needs or r.provides])
-        non_caring_indices = set(range(len(registrations))) - caring_indices
-        for caring_index, uncaring_index in itertools.product(caring_indices, non_caring_indices):
+        # Instead of an edge between every caring and every non-caring registration, both sides are connected
+        # through a barrier node (indexed right after the last registration), keeping the edge count linear.
+        # When unused, the barrier is an isolated node which is always sorted last
+        barrier_index = len(registrations)
+        caring_indices = [idx for idx, r in enumerate(registrations) if r.needs or r.provides]
+        non_caring_indices = [idx for idx, r in enumerate(registrations) if not (r.needs or r.provides)]
+        if caring_indices and non_caring_indices:
             if unconstrained_priority == FIRST:
-                pair = (uncaring_index, caring_index)
+                before, after = non_caring_indices, caring_indices
             else:
-                pair = (caring_index, uncaring_index)
-            graph.add(pair)
-
+                before, after = caring_indices, non_caring_indices
+            graph.update((idx, barrier_index) for idx in before)
+            graph.update((barrier_index, idx) for idx in after)
 
     return graph
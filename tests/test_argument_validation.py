@@ -54,6 +54,31 @@ def test_strict_hook_correct_arg_names_and_types(validating_hook, kwargs):
     validating_hook.trigger(kwargs=kwargs)
 
 
+@pytest.mark.parametrize('kwargs, message', [
+    ({'x': 1, 'y': 2, 'z': 's', 'w': 0}, "Unknown arguments specified: w"),
+    ({'x': 1, 'z': 's'}, "Missing argument 'y'"),
+    ({'x': 1, 'y': 2, 'w': 0}, "Unknown arguments specified: w"),
+    ({'x': 1, 'y': 2.0, 'z': 's'}, "Incorrect type for argument y. Expected <class 'int'>, got <class 'float'>"),
+    ({'x': 1, 'y': 2, 'z': 3}, "Incorrect type for argument z. Expected (<class 'str'>, <class 'float'>), got <class 'int'>"),
+])
+def test_strict_hook_validation_messages(validating_hook, kwargs, message):
+    with pytest.raises(TypeError) as excinfo:
+        validating_hook.trigger(kwargs=kwargs)
+    assert str(excinfo.value) == message
+
+
+def test_strict_hook_validates_defined_arg_names_only_once_defined(request):
+    group = gossip.get_or_create_group('late_strict_group')
+    group.set_strict()
+    request.addfinalizer(group.undefine)
+    hook = gossip.define('late_strict_group.hook')
+    hook.validate_kwargs({'anything': 1})
+    hook.configure(arg_names=['x'])
+    hook.validate_kwargs({'x': 1})
+    with pytest.raises(TypeError):
+        hook.validate_kwargs({'anything': 1})
+
+
 
 @pytest.fixture
 def validating_hook(request):
@@ -0,0 +1,124 @@
+# pylint: disable=unused-variable
+import asyncio
+
+import pytest
+
+import gossip
+from gossip.exceptions import CannotResolveDependencies
+
+
+def test_trigger_async_awaits_coroutine_handlers(hook_name):
+    called = []
+
+    @gossip.register(hook_name)
+    async def async_handler(x):
+        await asyncio.sleep(0)
+        called.append(('async', x))
+
+    @gossip.register(hook_name)
+    def sync_handler(x):
+        called.append(('sync', x))
+
+    asyncio.run(gossip.trigger_async(hook_name, x=1))
+    # the handlers are independent, so the synchronous one completes while the coroutine is sleeping
+    assert called == [('sync', 1), ('async', 1)]
+
+
+def test_trigger_async_runs_independent_handlers_concurrently(hook_name):
+    started = []
+
+    async def wait_for_both():
+        started.append(None)
+        while len(started) < 2:
+            await asyncio.sleep(0)
+
+    gossip.register(hook_name)(wait_for_both)
+    gossip.register(hook_name)(wait_for_both)
+
+    asyncio.run(asyncio.wait_for(gossip.trigger_async(hook_name), timeout=5))
+
+
+def test_trigger_async_respects_dependencies(timeline):
+    events = []
+
+    @gossip.register(timeline.hook_name, needs=['a'])
+    async def needer():
+        events.append('needer')
+
+    @gossip.register(timeline.hook_name, provides=['a'])
+    async def provider():
+        await asyncio.sleep(0.01)
+        events.append('provider')
+
+    asyncio.run(gossip.trigger_async(timeline.hook_name))
+    assert events == ['provider', 'needer']
+
+
+def test_trigger_async_not_now(hook_name):
+    events = []
+
+    @gossip.register(hook_name)
+    async def waiter():
+        gossip.wait_for('other' in events)
+        events.append('waiter')
+
+    @gossip.register(hook_name)
+    async def other():
+        events.append('other')
+
+    asyncio.run(gossip.trigger_async(hook_name))
+    assert events == ['other', 'waiter']
+
+
+def test_trigger_async_unresolvable_not_now(hook_name):
+
+    @gossip.register(hook_name)
+    async def never():
+        gossip.not_now()
+
+    with pytest.raises(CannotResolveDependencies):
+        asyncio.run(gossip.trigger_async(hook_name))
+
+
+def test_trigger_async_muted(hook_name, checkpoint):
+
+    @gossip.register(hook_name)
+    async def handler():
+        checkpoint()
+
+    async def trigger_muted():
+        with gossip.mute_context([hook_name]):
+            await gossip.trigger_async(hook_name)
+
+    asyncio.run(trigger_muted())
+    assert not checkpoint.called
+
+
+@pytest.mark.parametrize('policy', [gossip.RaiseDefer(), gossip.IgnoreExceptions(), gossip.RaiseImmediately()])
+def test_trigger_async_exception_policy(hook_name, policy):
+    called = []
+
+    @gossip.register(hook_name)
+    async def failing():
+        called.append('failing')
+        raise CustomException()
+
+    @gossip.register(hook_name)
+    async def other():
+        called.append('other')
+
+    gossip.set_exception_policy(policy)
+    try:
+        if isinstance(policy, gossip.IgnoreExceptions):
+            asyncio.run(gossip.trigger_async(hook_name))
+        else:
+            with pytest.raises(CustomException):
+                asyncio.run(gossip.trigger_async(hook_name))
+    finally:
+        gossip.set_exception_policy(gossip.RaiseImmediately())
+    # both handlers are independent, so they run concurrently regardless of the policy
+    assert called == ['failing', 'other']
+
+
+class CustomException(Exception):
+    pass
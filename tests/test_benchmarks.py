@@ -0,0 +1,50 @@
+import json
+
+import gossip
+from gossip import benchmarks
+from gossip.benchmarks.__main__ import main
+
+
+def test_benchmarks_smoke(tmpdir, capsys):
+    path = str(tmpdir.join('results.json'))
+    assert main(['--quick', '--json', path]) == 0
+    with open(path, encoding='utf-8') as f:
+        output = json.load(f)
+    results = output['results']
+    assert set(results) == set(func.__name__ for func in benchmarks.get_benchmarks())
+    assert all(value >= 0 for measurements in results.values() for value in measurements.values())
+    assert results['trigger_by_handler_count'].keys() == {
+        'trigger_0_handlers_ns', 'trigger_1_handlers_ns', 'trigger_10_handlers_ns', 'trigger_1000_handlers_ns'}
+    assert not [hook for hook in gossip.get_all_hooks() if hook.full_name.startswith('gossip_benchmarks')]
+
+    assert main(['--quick', '--baseline', path, '--threshold', '1000', 'empty_trigger']) == 0
+    assert 'empty_trigger.trigger_empty_hook_ns' in capsys.readouterr().out
+
+
+def test_json_to_stdout(capsys):
+    assert main(['--quick', '--json', '-', 'topological_sort']) == 0
+    captured = capsys.readouterr()
+    assert list(json.loads(captured.out)['results']) == ['topological_sort']
+    assert 'topological_sort' in captured.err
+
+
+def test_unknown_benchmark(capsys):
+    assert main(['no_such_benchmark']) == 2
+    assert 'no_such_benchmark' in capsys.readouterr().err
+
+
+def test_compare_to_baseline():
+    results = {'a': {'x_ns': 100.0, 'y_ns': 130.0, 'new_ns': 1.0}, 'new': {'z_ns': 1.0}}
+    baseline = {'a': {'x_ns': 100.0, 'y_ns': 100.0}, 'removed': {'w_ns': 1.0}}
+    assert benchmarks.compare_to_baseline(results, baseline, threshold=0.2) == [
+        ('a', 'x_ns', 100.0, 100.0, False),
+        ('a', 'y_ns', 100.0, 130.0, True),
+    ]
+
+
+def test_regression_exit_code(tmpdir, capsys):
+    path = str(tmpdir.join('baseline.json'))
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'results': {'topological_sort': {'sort_10_registrations_ms': 0.0}}}, f)
+    assert main(['--quick', '--baseline', path, 'topological_sort']) == 1
+    assert 'REGRESSION' in capsys.readouterr().out
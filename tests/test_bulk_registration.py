@@ -0,0 +1,123 @@
+import threading
+
+import pytest
+
+import gossip
+import gossip.utils
+from gossip.exceptions import CannotResolveDependencies
+
+
+def test_bulk_registration_sorts_each_hook_once(timeline, monkeypatch):
+    sort_calls = []
+    original_sort = gossip.utils.topological_sort_registrations
+
+    def counting_sort(registrations, **kwargs):
+        sort_calls.append(len(registrations))
+        return original_sort(registrations, **kwargs)
+
+    monkeypatch.setattr(gossip.utils, 'topological_sort_registrations', counting_sort)
+
+    with gossip.bulk_registration():
+        events = [timeline.register(needs=[str(i + 1)], provides=[str(i)]) for i in range(10)]
+        events.append(timeline.register(provides=['10']))
+        assert not sort_calls
+
+    assert sort_calls == [11]
+    timeline.trigger()
+    assert sorted(events, key=lambda e: e.timestamp) == events[::-1]
+
+
+def test_bulk_registration_rollback_on_cycle(timeline):
+    existing = timeline.register(provides=['a'])
+    hook = timeline.get_hook()
+
+    with pytest.raises(CannotResolveDependencies):
+        with gossip.bulk_registration():
+            timeline.register(needs=['b'], provides=['c'])
+            timeline.register(needs=['c'], provides=['b'])
+
+    assert [r.provides for r in hook.get_registrations()] == [frozenset(['a'])]
+    assert not hook._unmet_deps  # pylint: disable=protected-access
+    timeline.trigger()
+    assert existing.timestamp
+
+
+def test_bulk_registrations_are_not_triggered_before_exit(hook):
+    called = []
+    existing = hook.register(lambda: called.append('existing'), provides=['a'])
+    with gossip.bulk_registration():
+        hook.register(lambda: called.append('last'), needs=['b'])
+        hook.register(lambda: called.append('middle'), needs=['a'], provides=['b'])
+        assert hook.get_registrations() == [existing]
+        thread = threading.Thread(target=hook.trigger, args=({},))
+        thread.start()
+        thread.join()
+        assert called == ['existing']
+    del called[:]
+    hook.trigger({})
+    assert called == ['existing', 'middle', 'last']
+
+
+def test_bulk_registration_failure_adds_nothing(hook):
+    other_hook = gossip.define('other_bulk_hook')
+    with pytest.raises(CannotResolveDependencies):
+        with gossip.bulk_registration():
+            added_before = other_hook.register(lambda: None, provides=['a'], token='bulk_token')
+            hook.register(lambda: None)
+            hook.register(lambda: None, needs=['b'], provides=['c'])
+            hook.register(lambda: None, needs=['c'], provides=['b'])
+
+    assert not gossip.get_all_registrations()
+    assert not hook._unmet_deps  # pylint: disable=protected-access
+    assert added_before.hook is None
+    added_before.unregister()  # never added, so there is nothing to remove
+    assert not gossip.registration.get_token_registrations('bulk_token')
+
+
+def test_bulk_registration_rejects_self_dependency(hook):
+    registered = hook.register(lambda: None, provides=['b'])
+    with pytest.raises(CannotResolveDependencies):
+        with gossip.bulk_registration():
+            hook.register(lambda: None, needs=['a'], provides=['a'])
+    assert hook.get_registrations() == [registered]
+
+
+def test_unregister_within_bulk_registration(hook):
+    called = []
+    with gossip.bulk_registration():
+        unregistered = hook.register(lambda: called.append('unregistered'))
+        hook.register(lambda: called.append('kept'))
+        unregistered.unregister()
+        hook.unregister_all()
+        hook.register(lambda: called.append('registered after unregister_all'))
+    hook.trigger({})
+    assert called == ['registered after unregister_all']
+
+
+def test_nested_bulk_registration_resolves_on_outermost_exit(timeline):
+    with gossip.bulk_registration():
+        with gossip.bulk_registration():
+            evt1 = timeline.register(needs=['a'])
+        evt2 = timeline.register(provides=['a'])
+    timeline.trigger()
+    assert evt2.timestamp < evt1.timestamp
+
+
+def test_bulk_registration_body_exception_resolves_order(timeline):
+    with pytest.raises(ZeroDivisionError):
+        with gossip.bulk_registration():
+            evt1 = timeline.register(needs=['a'])
+            evt2 = timeline.register(provides=['a'])
+            1 / 0  # pylint: disable=pointless-statement
+    timeline.trigger()
+    assert evt2.timestamp < evt1.timestamp
+
+
+def test_blueprint_install_cycle_uninstalls():
+    blueprint = gossip.Blueprint()
+    blueprint.register('bulk_hook', needs=['x'], provides=['y'])(lambda: None)
+    blueprint.register('bulk_hook', needs=['y'], provides=['x'])(lambda: None)
+
+    with pytest.raises(CannotResolveDependencies):
+        blueprint.install()
+    assert not gossip.get_all_registrations()
@@ -0,0 +1,186 @@
+# pylint: disable=unused-variable
+import threading
+import time
+
+import pytest
+
+import gossip
+from gossip import coalesce
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def coalescing_hook(hook_name, calls):
+    returned = gossip.define(hook_name, coalesce=True)
+
+    @gossip.register(hook_name)
+    def handler(**kwargs):
+        calls.append(kwargs)
+
+    return returned
+
+
+def test_coalescing_block(coalescing_hook, calls):
+    with gossip.coalescing():
+        for value in range(3):
+            gossip.trigger(coalescing_hook.full_name, value=value, other=value * 2)
+        assert not calls
+    assert calls == [{'value': 2, 'other': 4}]
+
+
+def test_coalescing_merge_function(hook_name, calls):
+    gossip.define(hook_name, coalesce=lambda pending, new: {'keys': pending['keys'] + new['keys']})
+
+    @gossip.register(hook_name)
+    def handler(keys):
+        calls.append(keys)
+
+    with gossip.coalescing():
+        gossip.trigger(hook_name, keys=['a'])
+        gossip.trigger(hook_name, keys=['b'])
+    assert calls == [['a', 'b']]
+
+
+def test_coalescing_block_does_not_affect_other_hooks(hook_name, checkpoint):
+    gossip.register(hook_name)(checkpoint)
+    with gossip.coalescing():
+        gossip.trigger(hook_name)
+        assert checkpoint.called
+
+
+def test_nested_coalescing_blocks(coalescing_hook, calls):
+    with gossip.coalescing():
+        with gossip.coalescing():
+            gossip.trigger(coalescing_hook.full_name, value=1)
+        assert not calls
+        gossip.trigger(coalescing_hook.full_name, value=2)
+    assert calls == [{'value': 2}]
+
+
+def test_coalescing_delivers_in_trigger_context(coalescing_hook, calls):
+    with gossip.coalescing():
+        with gossip.mute_context([coalescing_hook.full_name]):
+            gossip.trigger(coalescing_hook.full_name, value=1)
+    assert not calls
+
+    with gossip.coalescing():
+        gossip.trigger(coalescing_hook.full_name, value=2)
+        with gossip.mute_context([coalescing_hook.full_name]):
+            gossip.trigger(coalescing_hook.full_name, value=3)
+    assert calls == [{'value': 2}]
+
+
+def test_coalescing_delivers_all_triggers_on_handler_exception(hook_name, calls):
+    gossip.define('{0}.a'.format(hook_name), coalesce=True)
+    gossip.define('{0}.b'.format(hook_name), coalesce=True)
+
+    @gossip.register('{0}.a'.format(hook_name))
+    def failing_handler():
+        raise ZeroDivisionError()
+
+    @gossip.register('{0}.b'.format(hook_name))
+    def handler():
+        calls.append('b')
+
+    with pytest.raises(ZeroDivisionError):
+        with gossip.coalescing():
+            gossip.trigger('{0}.a'.format(hook_name))
+            gossip.trigger('{0}.b'.format(hook_name))
+    assert calls == ['b']
+
+
+def test_coalescing_delivery_order():
+    calls = []
+    for hook_name in ['coalesced_a', 'coalesced_b']:
+        gossip.define(hook_name, coalesce=True)
+        gossip.register(hook_name)(lambda hook_name=hook_name: calls.append(hook_name))
+
+    with gossip.coalescing():
+        gossip.trigger('coalesced_b')
+        gossip.trigger('coalesced_a')
+        gossip.trigger('coalesced_b')
+    assert calls == ['coalesced_b', 'coalesced_a']
+
+
+def test_coalescing_keeps_tags_apart(coalescing_hook, calls):
+    with gossip.coalescing():
+        gossip.trigger_with_tags(coalescing_hook.full_name, {'value': 1}, tags=('a',))
+        gossip.trigger_with_tags(coalescing_hook.full_name, {'value': 2}, tags=('b',))
+        gossip.trigger_with_tags(coalescing_hook.full_name, {'value': 3}, tags=['a'])
+    assert calls == [{'value': 3}, {'value': 2}]
+
+
+def test_coalescing_block_delivers_on_exception(coalescing_hook, calls):
+    with pytest.raises(ZeroDivisionError):
+        with gossip.coalescing():
+            gossip.trigger(coalescing_hook.full_name, value=1)
+            1 / 0  # pylint: disable=pointless-statement
+    assert calls == [{'value': 1}]
+
+
+def test_coalescing_validates_eagerly():
+    gossip.define('strict_coalescing.hook', arg_names={'value': int}, coalesce=True)
+    gossip.get_group('strict_coalescing').set_strict()
+    gossip.register('strict_coalescing.hook')(lambda value: None)
+
+    with gossip.coalescing():
+        with pytest.raises(TypeError):
+            gossip.trigger('strict_coalescing.hook', value='a')
+
+
+def test_coalescing_is_local_to_thread(coalescing_hook, calls):
+    with gossip.coalescing():
+        thread = threading.Thread(target=gossip.trigger, args=(coalescing_hook.full_name,), kwargs={'value': 1})
+        thread.start()
+        thread.join()
+        assert calls == [{'value': 1}]
+
+
+def test_disable_coalescing(coalescing_hook, calls):
+    coalescing_hook.configure(coalesce=False)
+    with gossip.coalescing():
+        gossip.trigger(coalescing_hook.full_name, value=1)
+        assert calls == [{'value': 1}]
+
+
+def test_debounce(hook_name, calls):
+    gossip.define(hook_name, debounce_ms=500)
+    delivered = threading.Event()
+
+    @gossip.register(hook_name)
+    def handler(value):
+        calls.append((value, threading.current_thread()))
+        delivered.set()
+
+    for value in range(3):
+        gossip.trigger(hook_name, value=value)
+    assert not calls
+    assert delivered.wait(5)
+    time.sleep(0.1)
+    assert [value for value, _ in calls] == [2]
+    assert calls[0][1] is not threading.current_thread()
+
+
+def test_debounce_flush(hook_name, calls):
+    gossip.define(hook_name, debounce_ms=60 * 1000, coalesce=lambda pending, new: {'value': pending['value'] + new['value']})
+
+    @gossip.register(hook_name)
+    def handler(value):
+        calls.append(value)
+
+    for value in range(4):
+        gossip.trigger(hook_name, value=value)
+    coalesce.flush()
+    assert calls == [6]
+    coalesce.flush()
+    assert calls == [6]
+
+
+@pytest.mark.parametrize('kwargs', [{'debounce_ms': 0}, {'coalesce': 'not callable'}])
+def test_invalid_coalescing_parameters(hook_name, kwargs):
+    with pytest.raises(ValueError):
+        gossip.define(hook_name, **kwargs)
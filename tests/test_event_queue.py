@@ -0,0 +1,163 @@
+# pylint: disable=unused-variable, redefined-outer-name
+import threading
+
+import logbook
+import pytest
+
+import gossip
+from gossip import event_queue
+from gossip.exceptions import EventQueueFull
+
+
+@pytest.fixture
+def queue_factory():
+    def factory(**kwargs):
+        returned = event_queue.EventQueue(**kwargs)
+        event_queue.set_event_queue(returned)
+        return returned
+    yield factory
+    event_queue.set_event_queue(None)
+
+
+@pytest.fixture
+def blocked_hook(hook_name):
+    """A hook whose handler blocks until released, recording the events delivered
+    """
+    started = threading.Event()
+    release = threading.Event()
+    delivered = []
+
+    @gossip.register(hook_name)
+    def handler(index):
+        started.set()
+        assert release.wait(5)
+        delivered.append(index)
+
+    return hook_name, started, release, delivered
+
+
+def test_post_delivers_in_order_in_background(hook_name, queue_factory):
+    queue_factory()
+    delivered = []
+
+    @gossip.register(hook_name)
+    def handler(index):
+        delivered.append((index, threading.current_thread()))
+
+    for index in range(100):
+        assert gossip.post(hook_name, index=index)
+    assert event_queue.flush(timeout=5)
+    assert [index for index, _ in delivered] == list(range(100))
+    assert all(thread is not threading.current_thread() for _, thread in delivered)
+
+
+def test_post_to_nonexistent_hook(queue_factory):
+    queue_factory()
+    gossip.post('nonexistent_hook', x=1)
+    assert event_queue.flush(timeout=5)
+
+
+def test_post_keeps_mute_context(hook_name, queue_factory, checkpoint):
+    queue_factory()
+    gossip.register(hook_name)(checkpoint)
+    with gossip.mute_context([hook_name]):
+        gossip.post(hook_name)
+    assert event_queue.flush(timeout=5)
+    assert not checkpoint.called
+
+
+def test_handler_exceptions_do_not_stop_delivery(hook_name, queue_factory):
+    queue_factory()
+    delivered = []
+
+    @gossip.register(hook_name)
+    def handler(index):
+        delivered.append(index)
+        raise ZeroDivisionError()
+
+    gossip.post(hook_name, index=1)
+    gossip.post(hook_name, index=2)
+    assert event_queue.flush(timeout=5)
+    assert delivered == [1, 2]
+
+
+@pytest.mark.parametrize('overflow_policy', [event_queue.DROP, event_queue.DROP_OLDEST, event_queue.RAISE])
+def test_overflow_policies(blocked_hook, queue_factory, overflow_policy):
+    hook_name, started, release, delivered = blocked_hook
+    queue = queue_factory(max_size=2, overflow_policy=overflow_policy)
+    gossip.post(hook_name, index=0)
+    assert started.wait(5)
+    gossip.post(hook_name, index=1)
+    gossip.post(hook_name, index=2)
+
+    if overflow_policy == event_queue.RAISE:
+        with pytest.raises(EventQueueFull):
+            gossip.post(hook_name, index=3)
+        expected = [0, 1, 2]
+    elif overflow_policy == event_queue.DROP:
+        assert not gossip.post(hook_name, index=3)
+        expected = [0, 1, 2]
+    else:
+        assert gossip.post(hook_name, index=3)
+        expected = [0, 2, 3]
+    release.set()
+    assert queue.flush(timeout=5)
+    assert delivered == expected
+    assert queue.get_num_dropped() == (0 if overflow_policy == event_queue.RAISE else 1)
+
+
+def test_block_overflow_policy(blocked_hook, queue_factory):
+    hook_name, started, release, delivered = blocked_hook
+    queue = queue_factory(max_size=1)
+    gossip.post(hook_name, index=0)
+    assert started.wait(5)
+    gossip.post(hook_name, index=1)
+
+    poster = threading.Thread(target=gossip.post, args=(hook_name,), kwargs={'index': 2})
+    poster.start()
+    poster.join(0.05)
+    assert poster.is_alive()
+    assert queue.get_num_pending() == 2
+    release.set()
+    poster.join(5)
+    assert queue.flush(timeout=5)
+    assert delivered == [0, 1, 2]
+
+
+def test_flush_timeout(blocked_hook, queue_factory):
+    hook_name, started, release, _ = blocked_hook
+    queue = queue_factory()
+    gossip.post(hook_name, index=0)
+    assert not queue.flush(timeout=0.01)
+    release.set()
+    assert queue.flush(timeout=5)
+
+
+def test_flush_at_exit_timeout(blocked_hook, queue_factory, monkeypatch):
+    hook_name, started, release, _ = blocked_hook
+    queue_factory()
+    monkeypatch.setattr(event_queue, 'EXIT_FLUSH_TIMEOUT', 0.01)
+    gossip.post(hook_name, index=0)
+    gossip.post(hook_name, index=1)
+    assert started.wait(5)
+    with logbook.TestHandler() as log_handler:
+        event_queue._flush_at_exit()  # pylint: disable=protected-access
+    release.set()
+    [record] = [record for record in log_handler.records if record.level == logbook.WARNING]
+    assert record.message.startswith('2 posted events were not delivered')
+
+
+def test_stop(hook_name, queue_factory, checkpoint):
+    queue = queue_factory()
+    gossip.register(hook_name)(checkpoint)
+    gossip.post(hook_name)
+    queue.stop()
+    assert checkpoint.called
+    with pytest.raises(RuntimeError):
+        queue.post(hook_name, {})
+
+
+@pytest.mark.parametrize('kwargs', [{'max_size': 0}, {'overflow_policy': 'unknown'}])
+def test_invalid_queue_parameters(kwargs):
+    with pytest.raises(ValueError):
+        event_queue.EventQueue(**kwargs)
@@ -0,0 +1,159 @@
+# pylint: disable=unused-variable, unused-argument
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import gossip
+
+
+@pytest.fixture
+def executor():
+    returned = ThreadPoolExecutor(4)
+    yield returned
+    returned.shutdown()
+
+
+@pytest.fixture
+def executor_group(executor):
+    group = gossip.get_or_create_group('executor_group')
+    group.set_executor(executor)
+    return group
+
+
+def test_independent_handlers_run_in_parallel(executor_group):
+    barrier = threading.Barrier(3, timeout=5)
+    threads = set()
+
+    for _ in range(3):
+        @gossip.register('executor_group.hook')
+        def handler():
+            threads.add(threading.current_thread())
+            barrier.wait()
+
+    gossip.trigger('executor_group.hook')
+    assert len(threads) == 3
+    assert threading.current_thread() not in threads
+
+
+def test_levels_run_in_dependency_order(executor_group):
+    events = []
+    lock = threading.Lock()
+
+    def make_handler(name):
+        def handler():
+            with lock:
+                events.append(name)
+        return handler
+
+    gossip.register('executor_group.sub.hook', needs=['a', 'b'])(make_handler('last'))
+    gossip.register('executor_group.sub.hook', provides=['a'])(make_handler('a'))
+    gossip.register('executor_group.sub.hook', provides=['b'])(make_handler('b'))
+
+    gossip.trigger('executor_group.sub.hook')
+    assert sorted(events[:2]) == ['a', 'b']
+    assert events[2] == 'last'
+
+
+def test_nested_triggers_do_not_exhaust_executor():
+    executor = ThreadPoolExecutor(2)
+    gossip.get_or_create_group('small_executor_group').set_executor(executor)
+    barrier = threading.Barrier(2, timeout=5)
+    inner_threads = []
+
+    for _ in range(2):
+        @gossip.register('small_executor_group.outer')
+        def outer():
+            barrier.wait()  # both workers are busy when the inner hook is triggered
+            gossip.trigger('small_executor_group.inner')
+
+        @gossip.register('small_executor_group.inner')
+        def inner():
+            inner_threads.append(threading.current_thread())
+
+    thread = threading.Thread(target=gossip.trigger, args=('small_executor_group.outer',), daemon=True)
+    thread.start()
+    thread.join(5)
+    try:
+        assert not thread.is_alive()
+        assert len(inner_threads) == 4
+        assert threading.current_thread() not in inner_threads
+    finally:
+        executor.shutdown(wait=False)
+
+
+def test_not_now_in_executor(executor_group):
+    events = []
+
+    @gossip.register('executor_group.hook')
+    def waiter():
+        gossip.wait_for('other' in events)
+        events.append('waiter')
+
+    @gossip.register('executor_group.hook')
+    def other():
+        events.append('other')
+
+    gossip.trigger('executor_group.hook')
+    assert events == ['other', 'waiter']
+
+
+@pytest.mark.parametrize('policy', [gossip.RaiseImmediately(), gossip.RaiseDefer(), gossip.IgnoreExceptions()])
+def test_executor_exception_policy(executor_group, policy):
+    called = []
+
+    @gossip.register('executor_group.hook')
+    def failing():
+        called.append('failing')
+        raise CustomException()
+
+    @gossip.register('executor_group.hook', provides=['other'])
+    def other():
+        called.append('other')
+
+    @gossip.register('executor_group.hook', needs=['other'])
+    def later():
+        called.append('later')
+
+    executor_group.set_exception_policy(policy)
+    if isinstance(policy, gossip.IgnoreExceptions):
+        gossip.trigger('executor_group.hook')
+    else:
+        with pytest.raises(CustomException):
+            gossip.trigger('executor_group.hook')
+    # the whole level completes before exceptions are handled
+    assert sorted(called[:2]) == ['failing', 'other']
+    assert ('later' in called) == (not isinstance(policy, gossip.RaiseImmediately))
+
+
+def test_hook_executor_overrides_group(executor):
+    hook = gossip.define('inline_group.hook')
+    threads = []
+    hook.register(lambda: threads.append(threading.current_thread()))
+    hook.register(lambda: threads.append(threading.current_thread()))
+
+    hook.trigger({})
+    assert threads == [threading.current_thread()] * 2
+
+    hook.set_executor(executor)
+    del threads[:]
+    hook.trigger({})
+    assert threading.current_thread() not in threads
+
+
+def test_executor_inherited_from_parent(executor_group, executor):
+    subgroup = gossip.get_or_create_group('executor_group.subgroup')
+    assert subgroup.get_executor() is executor
+    assert gossip.get_global_group().get_executor() is None
+    executor_group.set_executor(None)
+    assert subgroup.get_executor() is None
+
+
+@pytest.mark.parametrize('invalid_executor', [object(), 1, ThreadPoolExecutor])
+def test_cannot_set_invalid_executor(invalid_executor):
+    with pytest.raises(ValueError):
+        gossip.get_or_create_group('some_group').set_executor(invalid_executor)
+
+
+class CustomException(Exception):
+    pass
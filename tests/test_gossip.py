@@ -1,3 +1,8 @@
+import asyncio
+import gc
+import threading
+import weakref
+
 import gossip
 import gossip.groups
 import pytest
@@ -193,6 +198,124 @@ def test_mute_trigger(checkpoint):
     assert checkpoint.called
 
 
+def test_mute_nested(checkpoint):
+
+    @gossip.register('a.b.c')
+    def handler():
+        checkpoint()
+
+    with gossip.mute_context(['a.b.c']):
+        with gossip.mute_context(['a.b.c', 'a.b.d']):
+            gossip.trigger('a.b.c')
+        gossip.trigger('a.b.c')
+    assert not checkpoint.called
+
+    gossip.trigger('a.b.c')
+    assert checkpoint.called
+
+
+def test_mute_generator(checkpoint):
+
+    @gossip.register('a.b.c')
+    def handler():
+        checkpoint()
+
+    with gossip.mute_context(name for name in ['a.b.c']):
+        gossip.trigger('a.b.c')
+    assert not checkpoint.called
+
+
+def test_mute_is_local_to_thread():
+    called = []
+
+    @gossip.register('a.b.c')
+    def handler():
+        called.append(threading.current_thread())
+
+    with gossip.mute_context(['a.b.c']):
+        thread = threading.Thread(target=gossip.trigger, args=('a.b.c',))
+        thread.start()
+        thread.join()
+        gossip.trigger('a.b.c')
+    assert called == [thread]
+
+
+def test_mute_is_local_to_task():
+    called = []
+
+    @gossip.register('a.b.c')
+    def handler(name):
+        called.append(name)
+
+    async def trigger(name, muted):
+        if muted:
+            with gossip.mute_context(['a.b.c']):
+                await asyncio.sleep(0.01)
+                await gossip.trigger_async('a.b.c', name=name)
+        else:
+            await gossip.trigger_async('a.b.c', name=name)
+
+    async def main():
+        await asyncio.gather(trigger('muted', muted=True), trigger('unmuted', muted=False))
+
+    asyncio.run(main())
+    assert called == ['unmuted']
+
+
+def test_mute_groups():
+    called = []
+    for hook_name in ['a.b', 'a.c.d', 'e.f']:
+        gossip.register(hook_name)(lambda hook_name=hook_name: called.append(hook_name))
+
+    with gossip.mute_context(groups=['a']):
+        assert gossip.get_group('a.c').is_muted()
+        assert not gossip.get_group('e').is_muted()
+        for hook_name in ['a.b', 'a.c.d', 'e.f']:
+            gossip.trigger(hook_name)
+    assert called == ['e.f']
+    assert not gossip.get_group('a.c').is_muted()
+
+
+def test_mute_group_object(checkpoint):
+
+    @gossip.register('a.b.c')
+    def handler():
+        checkpoint()
+
+    with gossip.mute_context(groups=[gossip.get_group('a.b')]):
+        gossip.trigger('a.b.c')
+    assert not checkpoint.called
+
+
+def test_mute_group_defined_later(checkpoint):
+    with gossip.mute_context(groups=['a']):
+        gossip.register('a.b.c')(checkpoint)
+        gossip.trigger('a.b.c')
+    assert not checkpoint.called
+
+
+def test_mute_group_forbidding_muting():
+    gossip.define('a.b.c')
+    gossip.get_group('a').forbid_muting()
+
+    with pytest.raises(CannotMuteHooks):
+        with gossip.mute_context(groups=['a.b']):
+            pass
+
+
+def test_mute_group_skips_hooks_forbidding_muting():
+    called = []
+    for hook_name in ['a.b', 'a.c.d']:
+        gossip.register(hook_name)(lambda hook_name=hook_name: called.append(hook_name))
+    gossip.get_hook('a.b').forbid_muting()
+    gossip.get_group('a.c').forbid_muting()
+
+    with gossip.mute_context(groups=['a']):
+        gossip.trigger('a.b')
+        gossip.trigger('a.c.d')
+    assert called == ['a.b', 'a.c.d']
+
+
 @pytest.mark.parametrize('arg', ['', 'name', 2, 2.0, True])
 def test_mute_accepts_only_lists(arg):
 
@@ -255,3 +378,23 @@ def test_forbid_muting(params):
 
     forbidden_obj.allow_muting()
     assert hook.can_be_muted() == is_allowed
+
+
+def test_registrations_share_tag_and_dependency_sets(hook):
+    registration1 = hook.register(lambda: None, tags=['a', 'b'], needs=['x'])
+    registration2 = hook.register(lambda: None, tags=('b', 'a'), needs='x')
+    registration3 = hook.register(lambda: None)
+    assert registration1.tags is registration2.tags
+    assert registration1.needs is registration2.needs
+    assert registration3.needs is registration3.provides is registration1.provides
+    assert not hasattr(registration1, '__dict__')
+
+
+def test_shared_sets_are_released_with_their_registrations(hook):
+    registration = hook.register(lambda: None, tags=['released_tag'], needs=['released_need'])
+    tags, needs = weakref.ref(registration.tags), weakref.ref(registration.needs)
+    del registration
+    hook.unregister_all()
+    gc.collect()
+    assert tags() is None
+    assert needs() is None
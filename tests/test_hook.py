@@ -95,3 +95,48 @@ def test_hook_str_repr(stringify):
 @pytest.fixture(name='doc_string')
 def doc_string_fixture():
     return 'Some hook doc'
+
+
+def test_dispatch_plan_is_cached_between_triggers(checkpoint):
+    # pylint: disable=protected-access
+    hook = define('cached_plan_hook')
+    registration = hook.register(checkpoint)
+
+    plan = hook._get_dispatch_plan()
+    hook.trigger({})
+    hook.trigger({})
+    assert hook._get_dispatch_plan() is plan
+    assert plan.registrations == (registration,)
+    assert checkpoint.num_times == 2
+
+
+@pytest.mark.parametrize('change', ['register', 'unregister', 'pre_trigger_callback', 'recompute'])
+def test_dispatch_plan_rebuilt_on_change(change):
+    # pylint: disable=protected-access
+    hook = define('changing_plan_hook')
+    registration = hook.register(lambda: None)
+    plan = hook._get_dispatch_plan()
+
+    if change == 'register':
+        hook.register(lambda: None)
+    elif change == 'unregister':
+        registration.unregister()
+    elif change == 'pre_trigger_callback':
+        hook.add_pre_trigger_callback(lambda registration, kwargs: None)
+    else:
+        hook.recompute_call_order()
+
+    new_plan = hook._get_dispatch_plan()
+    assert new_plan is not plan
+    assert list(new_plan.registrations) == hook.get_registrations()
+    assert list(new_plan.pre_trigger_callbacks) == hook._pre_trigger_callbacks
+
+
+def test_trigger_hook_without_handlers_skips_exception_policy(hook, hook_name, monkeypatch):
+
+    def fail(_):
+        raise AssertionError('exception policy should not be consulted')
+
+    monkeypatch.setattr(type(hook.group), 'get_exception_policy', fail)
+    trigger(hook_name)
+    hook.trigger({})
@@ -1,3 +1,7 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import gossip
 
 
@@ -25,3 +29,55 @@ def test_non_reentrant_hooks(counter):
 
     gossip.trigger(hook_name)
     assert counter == 1
+
+
+def test_non_reentrant_hooks_in_concurrent_threads(counter):
+    hook_name = 'nonreentrant_threaded_hook'
+    barrier = threading.Barrier(2, timeout=5)
+
+    @gossip.register(hook_name, reentrant=False)
+    def handler(): # pylint: disable=unused-variable
+        counter.add(1)
+        barrier.wait()  # both threads are inside the handler at once
+        gossip.trigger(hook_name)
+
+    threads = [threading.Thread(target=gossip.trigger, args=(hook_name,)) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert counter == 2
+
+
+def test_non_reentrant_hooks_in_concurrent_tasks(counter):
+    hook_name = 'nonreentrant_async_hook'
+
+    @gossip.register(hook_name, reentrant=False)
+    async def handler(): # pylint: disable=unused-variable
+        counter.add(1)
+        await asyncio.sleep(0.01)
+        await gossip.trigger_async(hook_name)
+
+    async def main():
+        await asyncio.gather(gossip.trigger_async(hook_name), gossip.trigger_async(hook_name))
+
+    asyncio.run(main())
+    assert counter == 2
+
+
+def test_non_reentrant_hooks_through_executor(counter):
+    hook_name = 'nonreentrant_executor_group.hook'
+    with ThreadPoolExecutor(2) as executor:
+        gossip.get_or_create_group('nonreentrant_executor_group').set_executor(executor)
+
+        @gossip.register(hook_name, reentrant=False)
+        def handler(): # pylint: disable=unused-variable
+            counter.add(1)
+            gossip.trigger(hook_name)
+
+        @gossip.register(hook_name)
+        def other_handler(): # pylint: disable=unused-variable
+            pass
+
+        gossip.trigger(hook_name)
+    assert counter == 1
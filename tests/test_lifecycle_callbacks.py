@@ -0,0 +1,146 @@
+# pylint: disable=unused-variable, protected-access
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import gossip
+from gossip import stats
+
+
+@pytest.fixture
+def events():
+    return []
+
+
+@pytest.fixture
+def observed_hook(hook_name, events):
+    returned = gossip.define(hook_name)
+
+    @returned.add_trigger_begin_callback
+    def begin(hook, kwargs):
+        events.append(('begin', hook, kwargs))
+
+    @returned.add_post_trigger_callback
+    def post(registration, kwargs, elapsed, exc_info):
+        assert elapsed >= 0
+        events.append(('post', registration, kwargs, exc_info))
+
+    @returned.add_trigger_end_callback
+    def end(hook, kwargs, elapsed, exc_info):
+        assert elapsed >= 0
+        events.append(('end', hook, kwargs, exc_info))
+
+    return returned
+
+
+def test_lifecycle_callbacks(observed_hook, events):
+
+    @gossip.register(observed_hook.full_name)
+    def handler(value):
+        events.append(('handler', value))
+
+    gossip.trigger(observed_hook.full_name, value=1)
+    assert events == [
+        ('begin', observed_hook, {'value': 1}),
+        ('handler', 1),
+        ('post', handler.gossip, {'value': 1}, None),
+        ('end', observed_hook, {'value': 1}, None),
+    ]
+
+
+def test_lifecycle_callbacks_not_called_without_handlers(observed_hook, events):
+    gossip.trigger(observed_hook.full_name)
+    assert not events
+
+
+def test_post_trigger_callback_exc_info(observed_hook, events):
+    observed_hook.group.set_exception_policy(gossip.IgnoreExceptions())
+
+    @gossip.register(observed_hook.full_name)
+    def handler():
+        raise ZeroDivisionError()
+
+    gossip.trigger(observed_hook.full_name)
+    [(_, registration, _, exc_info)] = [event for event in events if event[0] == 'post']
+    assert registration is handler.gossip
+    assert exc_info[0] is ZeroDivisionError
+    assert events[-1] == ('end', observed_hook, {}, None)
+
+
+def test_trigger_end_callback_exc_info(observed_hook, events):
+
+    @gossip.register(observed_hook.full_name)
+    def handler():
+        raise ZeroDivisionError()
+
+    with pytest.raises(ZeroDivisionError):
+        gossip.trigger(observed_hook.full_name)
+    assert events[-1][0] == 'end'
+    assert events[-1][-1][0] is ZeroDivisionError
+
+
+def test_non_reentrant_skips_are_not_reported(observed_hook, events):
+
+    @gossip.register(observed_hook.full_name, reentrant=False)
+    def handler():
+        gossip.trigger(observed_hook.full_name)
+
+    gossip.trigger(observed_hook.full_name)
+    assert [event[0] for event in events] == ['begin', 'begin', 'end', 'post', 'end']
+
+
+def test_lifecycle_callbacks_with_executor(observed_hook, events):
+    with ThreadPoolExecutor(2) as executor:
+        observed_hook.set_executor(executor)
+        registrations = [gossip.register(observed_hook.full_name)(lambda: None).gossip for _ in range(2)]
+        gossip.trigger(observed_hook.full_name)
+    assert sorted(event[1].id for event in events if event[0] == 'post') == sorted(r.id for r in registrations)
+    assert [events[0][0], events[-1][0]] == ['begin', 'end']
+
+
+def test_lifecycle_callbacks_async(observed_hook, events):
+
+    @gossip.register(observed_hook.full_name)
+    async def handler():
+        await asyncio.sleep(0)
+
+    asyncio.run(gossip.trigger_async(observed_hook.full_name))
+    assert [event[0] for event in events] == ['begin', 'post', 'end']
+    assert events[1][1] is handler.gossip
+
+
+def test_lifecycle_callbacks_with_batch_handler(observed_hook, events):
+    hook_name = observed_hook.full_name
+    gossip.register(hook_name)(lambda value: None)
+
+    @gossip.register(hook_name, batch=True)
+    def batch_handler(**_):
+        pass
+
+    stats.enable()
+    try:
+        gossip.trigger(hook_name, value=1)
+        asyncio.run(gossip.trigger_async(hook_name, value=2))
+        gossip.trigger_many(hook_name, [{'value': 3}, {'value': 4}])
+        hook_stats = gossip.get_stats()[hook_name]
+    finally:
+        stats.disable()
+        stats.reset()
+    assert [event[2] for event in events if event[0] == 'begin'] == [{'value': value} for value in range(1, 5)]
+    assert [event[2] for event in events if event[0] == 'end'] == [{'value': value} for value in range(1, 5)]
+    assert hook_stats.count == 4
+    assert hook_stats.handlers[batch_handler.gossip].count == 3
+    assert [event[2] for event in events if event[0] == 'post' and event[1] is batch_handler.gossip] == [
+        {'events': [{'value': 1}]}, {'events': [{'value': 2}]}, {'events': [{'value': 3}, {'value': 4}]}]
+
+
+def test_unobserved_plan(hook_name):
+    hook = gossip.define(hook_name)
+    gossip.register(hook_name)(lambda: None)
+    assert not hook._get_dispatch_plan().is_observed
+
+    callback = hook.add_post_trigger_callback(lambda registration, kwargs, elapsed, exc_info: None)
+    assert hook._get_dispatch_plan().is_observed
+    hook.remove_post_trigger_callback(callback)
+    assert not hook._get_dispatch_plan().is_observed
@@ -1,3 +1,4 @@
+import random
 import pytest
 
 import gossip
@@ -131,6 +132,20 @@ def test_needs_provides_unconstrained_priority(timeline, priority, use_parent_gr
         assert evt2.timestamp < evt1.timestamp < dontcare.timestamp
 
 
+@pytest.mark.parametrize('priority', [gossip.FIRST, gossip.LAST])
+def test_unconstrained_registration_keeps_call_order(hook, priority):
+    hook.group.set_unconstrained_handler_priority(priority)
+    hook.register(lambda: None, needs=['a'])
+    hook.register(lambda: None, needs=['a'], priority=-1)
+    hook.register(lambda: None, provides=['a'], priority=-1)
+    constrained = hook.get_registrations()
+    unconstrained = hook.register(lambda: None, priority=1)
+    if priority == gossip.FIRST:
+        assert hook.get_registrations() == [unconstrained] + constrained
+    else:
+        assert hook.get_registrations() == constrained + [unconstrained]
+
+
 def test_policy_gets_reset():
     gossip.get_global_group().set_unconstrained_handler_priority(gossip.FIRST)
     gossip.get_global_group().reset()
@@ -146,3 +161,53 @@ def test_unmet_dependencies(timeline):
 
     evt2 = timeline.register(provides=['a'])
     timeline.trigger() # ok
+
+
+@pytest.mark.parametrize('seed', range(10))
+@pytest.mark.parametrize('priority', [gossip.FIRST, gossip.DONT_CARE, gossip.LAST])
+def test_incremental_call_order(hook, seed, priority):
+    # pylint: disable=protected-access
+    rand = random.Random(seed)
+    hook.group.set_unconstrained_handler_priority(priority)
+    registrations = []
+    for _ in range(60):
+        previous_order = hook.get_registrations()
+        may_reorder = False
+        if registrations and rand.random() < 0.3:
+            registrations.pop(rand.randrange(len(registrations))).unregister()
+        elif rand.random() < 0.2:
+            registrations.append(hook.register_no_op(provides=rand.sample('abcdef', 1)))
+        elif rand.random() < 0.05:
+            # a registration needing what it provides itself is a cycle, and is rejected
+            with pytest.raises(CannotResolveDependencies):
+                hook.register(lambda: None, needs=['a'], provides=['a'])
+            assert hook.get_registrations() == previous_order
+        else:
+            # a registration only needs letters after the one it provides, so no cycles are formed
+            provided_index = rand.randrange(6)
+            provides = ['abcdef'[provided_index]] if rand.random() < 0.5 else []
+            needs = rand.sample('abcdef'[provided_index + 1:], min(rand.randint(0, 2), 5 - provided_index))
+            may_reorder = bool(needs or provides)
+            registrations.append(hook.register(lambda: None, needs=needs, provides=provides,
+                                               priority=rand.randint(-1, 1)))
+
+        ordered = hook.get_registrations()
+        if not may_reorder:
+            # unregistering, or registering an unconstrained handler, never reorders the other handlers
+            assert [r for r in ordered if r in previous_order] == [r for r in previous_order if r in ordered]
+        assert set(ordered + hook.get_registrations(include_empty=True)) == set(registrations)
+        expected_unmet = set(n for r in ordered for n in r.needs) - \
+            set(p for r in hook.get_registrations(include_empty=True) for p in r.provides)
+        assert hook._unmet_deps == expected_unmet
+        _assert_valid_call_order(ordered, priority)
+
+
+def _assert_valid_call_order(ordered, priority):
+    for index, registration in enumerate(ordered):
+        for later in ordered[index + 1:]:
+            assert not registration.needs & later.provides
+    constrained = [bool(r.needs or r.provides) for r in ordered]
+    if priority == gossip.FIRST:
+        assert constrained == sorted(constrained)
+    elif priority == gossip.LAST:
+        assert constrained == sorted(constrained, reverse=True)
@@ -0,0 +1,135 @@
+# pylint: disable=unused-variable, unused-argument
+import functools
+import os
+import threading
+
+import pytest
+
+import gossip
+from gossip.process_pool import get_process_pool, shutdown_process_pool
+
+# handlers shipped to worker processes must be picklable, so these tests use partials of builtins as handlers
+
+
+@pytest.fixture(autouse=True, scope='module')
+def process_pool():
+    yield
+    shutdown_process_pool()
+
+
+def test_process_handler_runs(hook_name, tmpdir):
+    path = str(tmpdir.join('created'))
+    gossip.register(hook_name, executor='process')(functools.partial(os.mkdir))
+    gossip.trigger(hook_name, path=path)
+    assert os.path.isdir(path)
+
+
+def test_process_handlers_respect_dependencies(hook_name, tmpdir):
+    path = str(tmpdir.join('created'))
+    seen = []
+
+    @gossip.register(hook_name, needs=['directory'])
+    def check(path):
+        seen.append(os.path.isdir(path))
+
+    gossip.register(hook_name, executor='process', provides=['directory'])(functools.partial(os.mkdir))
+
+    gossip.trigger(hook_name, path=path)
+    assert seen == [True]
+
+
+def test_process_handler_callable_instance(hook_name, tmpdir):
+    path = str(tmpdir.join('created'))
+    gossip.register(hook_name, executor='process')(make_directory)
+    assert not hasattr(make_directory, 'gossip')
+    gossip.trigger(hook_name, path=path)
+    assert os.path.isdir(path)
+
+
+def test_process_handler_exception(hook_name):
+    caught = []
+
+    @gossip.register('gossip.on_handler_exception')
+    def on_exception(handler, exception, hook):
+        caught.append(exception[0])
+
+    gossip.register(hook_name, executor='process')(functools.partial(int))
+    with pytest.raises(TypeError):
+        gossip.trigger(hook_name, unsupported_argument=2)
+    assert caught == [TypeError]
+
+
+@pytest.mark.parametrize('policy_class', [gossip.RaiseImmediately, gossip.RaiseDefer])
+def test_process_handlers_keep_exception_policy(hook_name, tmpdir, policy_class):
+    path = str(tmpdir.join('created'))
+    called = []
+    gossip.get_global_group().set_exception_policy(policy_class())
+
+    @gossip.register(hook_name)
+    def failing(path):
+        raise ZeroDivisionError()
+
+    @gossip.register(hook_name)
+    def after_failing(path):
+        called.append(path)
+
+    gossip.register(hook_name, executor='process')(functools.partial(os.mkdir))
+    with pytest.raises(ZeroDivisionError):
+        gossip.trigger(hook_name, path=path)
+    assert called == ([] if policy_class is gossip.RaiseImmediately else [path])
+    assert os.path.isdir(path)
+
+
+def test_process_handler_not_now(hook_name, tmpdir):
+    path = str(tmpdir.join('created'))
+    events = []
+
+    @gossip.register(hook_name)
+    def waiter(path):
+        gossip.wait_for(os.path.isdir(path))
+        events.append('waiter')
+
+    gossip.register(hook_name, executor='process')(functools.partial(os.mkdir))
+
+    gossip.trigger(hook_name, path=path)
+    assert events == ['waiter']
+
+
+def test_process_handler_with_trigger_async(hook_name, tmpdir):
+    import asyncio  # pylint: disable=import-outside-toplevel
+    path = str(tmpdir.join('created'))
+    gossip.register(hook_name, executor='process')(functools.partial(os.mkdir))
+    asyncio.run(gossip.trigger_async(hook_name, path=path))
+    assert os.path.isdir(path)
+
+
+def test_process_pool_created_once():
+    shutdown_process_pool()
+    barrier = threading.Barrier(8)
+    pools = []
+
+    def get_pool():
+        barrier.wait()
+        pools.append(get_process_pool())
+
+    threads = [threading.Thread(target=get_pool) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(map(id, pools))) == 1
+
+
+def test_invalid_executor(hook_name):
+    with pytest.raises(AssertionError):
+        gossip.register(hook_name, executor='thread')(functools.partial(os.mkdir))
+
+
+class MakeDirectory():
+
+    def __call__(self, path):
+        os.mkdir(path)
+
+
+# picklable, as an instance of a module-level class
+make_directory = MakeDirectory()
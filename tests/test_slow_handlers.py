@@ -0,0 +1,94 @@
+# pylint: disable=unused-variable, redefined-outer-name
+import asyncio
+import time
+
+import logbook
+import pytest
+
+import gossip
+
+
+@pytest.fixture
+def slow_reports():
+    returned = []
+
+    @gossip.register('gossip.on_slow_handler')
+    def on_slow_handler(handler, hook, elapsed_ms, budget_ms):
+        returned.append((handler, hook, elapsed_ms, budget_ms))
+
+    return returned
+
+
+def _slow_handler():
+    time.sleep(0.02)
+
+
+def _fast_handler():
+    pass
+
+
+def test_slow_handler_reported(slow_reports):
+    gossip.get_or_create_group('budgeted').set_handler_time_budget(5)
+    gossip.register('budgeted.hook')(_slow_handler)
+    gossip.register('budgeted.hook')(_fast_handler)
+
+    with logbook.TestHandler() as log_handler:
+        gossip.trigger('budgeted.hook')
+
+    [(handler, hook, elapsed_ms, budget_ms)] = slow_reports
+    assert handler is _slow_handler
+    assert hook is gossip.get_hook('budgeted.hook')
+    assert elapsed_ms >= 20
+    assert budget_ms == 5
+    [record] = [record for record in log_handler.records if record.level == logbook.WARNING]
+    assert '{0}._slow_handler'.format(__name__) in record.message
+    assert 'budgeted.hook' in record.message
+
+
+def test_handler_time_budget_is_inherited(slow_reports):
+    gossip.get_or_create_group('budgeted_parent').set_handler_time_budget(5)
+    group = gossip.get_or_create_group('budgeted_parent.child')
+    assert group.get_handler_time_budget() == 5
+    gossip.register('budgeted_parent.child.hook')(_slow_handler)
+    gossip.trigger('budgeted_parent.child.hook')
+    assert len(slow_reports) == 1
+
+    group.set_handler_time_budget(60 * 1000)
+    gossip.trigger('budgeted_parent.child.hook')
+    assert len(slow_reports) == 1
+
+
+def test_no_handler_time_budget_by_default(hook_name, slow_reports):
+    assert gossip.get_global_group().get_handler_time_budget() is None
+    gossip.register(hook_name)(_slow_handler)
+    gossip.trigger(hook_name)
+    assert not slow_reports
+    assert not gossip.get_hook(hook_name)._get_dispatch_plan().is_observed  # pylint: disable=protected-access
+
+
+def test_slow_async_handler_reported(slow_reports):
+    gossip.get_or_create_group('budgeted_async').set_handler_time_budget(5)
+
+    @gossip.register('budgeted_async.hook')
+    async def handler():
+        await asyncio.sleep(0.02)
+
+    asyncio.run(gossip.trigger_async('budgeted_async.hook'))
+    assert [report[0] for report in slow_reports] == [handler]
+
+
+def test_slow_internal_hook_handlers_are_not_reported(slow_reports):
+    gossip.get_global_group().set_handler_time_budget(5)
+    try:
+        gossip.register('gossip.on_slow_handler')(lambda **_: time.sleep(0.01))
+        gossip.register('budgeted_global.hook')(_slow_handler)
+        gossip.trigger('budgeted_global.hook')
+    finally:
+        gossip.get_global_group().set_handler_time_budget(None)
+    assert len(slow_reports) == 1
+
+
+@pytest.mark.parametrize('budget_ms', [0, -1])
+def test_invalid_handler_time_budget(budget_ms):
+    with pytest.raises(ValueError):
+        gossip.get_global_group().set_handler_time_budget(budget_ms)
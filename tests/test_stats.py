@@ -0,0 +1,129 @@
+# pylint: disable=unused-variable, redefined-outer-name, unused-argument
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import gossip
+from gossip import stats
+
+
+@pytest.fixture
+def enabled_stats():
+    stats.enable()
+    yield
+    stats.disable()
+    stats.reset()
+
+
+def test_stats_disabled_by_default(hook_name):
+    gossip.register(hook_name)(lambda: None)
+    gossip.trigger(hook_name)
+    assert not stats.is_enabled()
+    assert gossip.get_hook(hook_name)._get_dispatch_plan().recorders == ()  # pylint: disable=protected-access
+    assert hook_name not in gossip.get_stats()
+
+
+def test_stats(hook_name, enabled_stats):
+
+    @gossip.register(hook_name)
+    def slow_handler():
+        time.sleep(0.01)
+
+    @gossip.register(hook_name)
+    def fast_handler():
+        pass
+
+    for _ in range(3):
+        gossip.trigger(hook_name)
+
+    hook_stats = gossip.get_stats()[hook_name]
+    assert hook_stats.count == 3
+    assert hook_stats.exceptions == 0
+    assert hook_stats.total_time >= 0.03
+    assert hook_stats.mean_time == pytest.approx(hook_stats.total_time / 3)
+    slow_stats, fast_stats = [hook_stats.handlers[slow_handler.gossip], hook_stats.handlers[fast_handler.gossip]]
+    assert slow_stats.count == fast_stats.count == 3
+    assert slow_stats.p50 >= 0.01
+    assert slow_stats.p99 >= slow_stats.p50
+    assert fast_stats.p99 < slow_stats.p50
+
+
+def test_stats_count_exceptions(enabled_stats):
+    gossip.get_or_create_group('stats_group').set_exception_policy(gossip.IgnoreExceptions())
+
+    @gossip.register('stats_group.hook')
+    def handler(fail):
+        if fail:
+            raise ZeroDivisionError()
+
+    for fail in [True, False, True]:
+        gossip.trigger('stats_group.hook', fail=fail)
+    hook_stats = gossip.get_stats()['stats_group.hook']
+    assert hook_stats.exceptions == 2
+    assert hook_stats.handlers[handler.gossip].exceptions == 2
+    assert hook_stats.handlers[handler.gossip].count == 3
+
+
+def test_stats_with_executor(enabled_stats):
+    with ThreadPoolExecutor(2) as executor:
+        gossip.get_or_create_group('stats_executor_group').set_executor(executor)
+        for _ in range(2):
+            gossip.register('stats_executor_group.hook')(lambda: None)
+        gossip.trigger('stats_executor_group.hook')
+    hook_stats = gossip.get_stats()['stats_executor_group.hook']
+    assert hook_stats.count == 1
+    assert sorted(handler_stats.count for handler_stats in hook_stats.handlers.values()) == [1, 1]
+
+
+def test_stats_async(hook_name, enabled_stats):
+
+    @gossip.register(hook_name)
+    async def handler():
+        await asyncio.sleep(0.01)
+
+    asyncio.run(gossip.trigger_async(hook_name))
+    hook_stats = gossip.get_stats()[hook_name]
+    assert hook_stats.count == 1
+    assert hook_stats.handlers[handler.gossip].total_time >= 0.01
+
+
+def test_enabling_stats_rebuilds_dispatch_plans(hook_name):
+    gossip.register(hook_name)(lambda: None)
+    gossip.trigger(hook_name)
+    stats.enable()
+    try:
+        gossip.trigger(hook_name)
+    finally:
+        stats.disable()
+    gossip.trigger(hook_name)
+    assert gossip.get_stats()[hook_name].count == 1
+    stats.reset()
+    assert gossip.get_stats()[hook_name].count == 0
+
+
+def test_stats_dropped_with_handlers(hook_name, enabled_stats):
+    old_registration = gossip.register(hook_name)(lambda: None).gossip
+    gossip.trigger(hook_name)
+    gossip.get_hook(hook_name).unregister_all()
+    assert hook_name not in gossip.get_stats()
+
+    new_registration = gossip.register(hook_name)(lambda: None).gossip
+    gossip.trigger(hook_name)
+    hook_stats = gossip.get_stats()[hook_name]
+    assert hook_stats.count == 1
+    assert list(hook_stats.handlers) == [new_registration]
+    assert old_registration not in hook_stats.handlers
+
+    gossip.get_hook(hook_name).undefine()
+    assert hook_name not in gossip.get_stats()
+
+
+def test_percentiles_of_recent_calls(hook_name, enabled_stats):
+    gossip.register(hook_name)(lambda: None)
+    for _ in range(stats.MAX_SAMPLES + 10):
+        gossip.trigger(hook_name)
+    hook_stats = gossip.get_stats()[hook_name]
+    assert hook_stats.count == stats.MAX_SAMPLES + 10
+    assert 0 < hook_stats.p50 <= hook_stats.p99
@@ -125,3 +125,20 @@ def test_set_strict_with_subgroups_and_tags(hook_name):
     with pytest.raises(UnsupportedHookTags):
         gossip.trigger_with_tags(hook_name, tags=("fake_tag",))
     gossip.trigger_with_tags(hook_name, tags=("some_tag", "other_tag"))
+
+
+@pytest.mark.parametrize('trigger_tags', [None, (), ('tag1',), ('tag2',), ['tag1', 'tag2'], ('unknown',)])
+def test_tagged_trigger_preserves_call_order(trigger_tags):
+    hook_name = 'tag_order_group.ordered_hook'
+    called = []
+    registration_tags = [None, ('tag1',), ('tag2',), ('tag1', 'tag2'), None, ('tag2',), ('tag1',)]
+    for index, tags in enumerate(registration_tags):
+        gossip.register(hook_name, tags=tags, priority=index % 3)(lambda index=index: called.append(index))
+
+    hook = gossip.get_hook(hook_name)
+    expected = [registration.func.__defaults__[0] for registration in hook.get_registrations()
+                if registration.has_tags(trigger_tags)]
+    for _ in range(2):
+        del called[:]
+        gossip.trigger_with_tags(hook_name, tags=trigger_tags)
+        assert called == expected
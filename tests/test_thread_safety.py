@@ -0,0 +1,150 @@
+# pylint: disable=unused-variable
+import sys
+import threading
+
+import pytest
+
+import gossip
+from gossip import registry
+from gossip.exceptions import NameAlreadyUsed
+from gossip.registration import get_token_registrations
+
+_NUM_ITERATIONS = 2000
+
+
+@pytest.fixture(autouse=True)
+def frequent_thread_switches():
+    prev = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(prev)
+
+
+def _run_concurrently(*funcs):
+    errors = []
+
+    def wrapper(func):
+        try:
+            func()
+        except BaseException as e:  # pylint: disable=broad-except
+            errors.append(e)
+
+    threads = [threading.Thread(target=wrapper, args=(func,)) for func in funcs]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors, errors
+
+
+def test_trigger_during_register_and_unregister(hook_name):
+    calls = []
+    gossip.register(hook_name)(lambda: calls.append(None))
+
+    def trigger():
+        for _ in range(_NUM_ITERATIONS):
+            gossip.trigger(hook_name)
+
+    def churn(index):
+        def func():
+            hook = gossip.get_hook(hook_name)
+            for iteration in range(_NUM_ITERATIONS // 4):
+                registrations = [
+                    hook.register(lambda: None, priority=iteration % 3),
+                    hook.register(lambda: None, provides=['x{0}'.format(index)], priority=-1),
+                    hook.register(lambda: None, needs=['x{0}'.format(index)]),
+                ]
+                for registration in reversed(registrations):
+                    registration.unregister()
+        return func
+
+    _run_concurrently(trigger, trigger, churn(0), churn(1))
+    assert len(calls) == 2 * _NUM_ITERATIONS
+    assert len(gossip.get_hook(hook_name).get_registrations()) == 1
+
+
+def test_get_registrations_waits_for_registration(hook):
+    # registering rewrites the call order in place under the registry lock, so it must not be read meanwhile
+    locked = threading.Event()
+    release = threading.Event()
+    read = []
+
+    def hold_lock():
+        with registry.lock:
+            locked.set()
+            release.wait(5)
+
+    holder = threading.Thread(target=hold_lock)
+    holder.start()
+    assert locked.wait(5)
+    reader = threading.Thread(target=lambda: read.append(hook.get_registrations(include_empty=True)))
+    reader.start()
+    reader.join(0.05)
+    assert not read
+    release.set()
+    reader.join(5)
+    holder.join(5)
+    assert read == [[]]
+
+
+def test_trigger_with_tags_during_register(hook_name):
+    calls = []
+    gossip.register(hook_name, tags=('a',))(lambda: calls.append(None))
+
+    def trigger():
+        for _ in range(_NUM_ITERATIONS):
+            gossip.trigger_with_tags(hook_name, tags=('a',))
+
+    def churn():
+        hook = gossip.get_hook(hook_name)
+        for _ in range(_NUM_ITERATIONS // 2):
+            hook.register(lambda: None, tags=('b',)).unregister()
+
+    _run_concurrently(trigger, churn)
+    assert len(calls) == _NUM_ITERATIONS
+
+
+def test_concurrent_define(hook_name):
+    defined = []
+    already_defined = []
+
+    def define():
+        try:
+            defined.append(gossip.define('group.{0}'.format(hook_name)))
+        except NameAlreadyUsed:
+            already_defined.append(None)
+
+    _run_concurrently(*[define for _ in range(8)])
+    assert len(defined) == 1
+    assert len(already_defined) == 7
+    assert gossip.get_group('group').get_hooks() == defined
+
+
+def test_concurrent_registration_to_new_hooks():
+    hook_names = ['concurrent_group{0}.hook{1}'.format(index % 3, index) for index in range(30)]
+
+    def register():
+        for name in hook_names:
+            gossip.register(name, token='token')(lambda: None)
+
+    _run_concurrently(*[register for _ in range(4)])
+    for name in hook_names:
+        assert len(gossip.get_hook(name).get_registrations()) == 4
+    assert len(get_token_registrations('token')) == 4 * len(hook_names)
+    gossip.unregister_token('token')
+    assert not get_token_registrations('token')
+
+
+def test_concurrent_mute_contexts(hook_name):
+    calls = []
+    gossip.register(hook_name)(lambda: calls.append(None))
+
+    def mute():
+        for _ in range(_NUM_ITERATIONS // 4):
+            with gossip.mute_context([hook_name]):
+                with gossip.mute_context([hook_name]):
+                    pass
+
+    _run_concurrently(*[mute for _ in range(4)])
+    gossip.trigger(hook_name)
+    assert len(calls) == 1
@@ -1,6 +1,9 @@
 from munch import Munch
 
 import gossip
+import gossip.groups
+from gossip.exceptions import CannotResolveDependencies
+from gossip.registration import get_token_registrations
 import pytest
 
 
@@ -81,3 +84,56 @@ def _get_all_registrations(include_empty=False):
     return [registration
             for hook in gossip.get_all_hooks()
             for registration in hook.get_registrations(include_empty=include_empty)]
+
+
+def test_unregister_token_does_not_scan_hooks(registrations, monkeypatch):  # pylint: disable=unused-argument
+
+    def fail(*_, **__):
+        raise AssertionError('unregister_token should not iterate over hooks')
+
+    monkeypatch.setattr(gossip.groups.Group, 'iter_hooks', fail)
+    gossip.unregister_token('token1')
+    monkeypatch.undo()
+    assert len(_get_all_registrations(include_empty=True)) == 2
+
+
+def test_token_index_follows_unregistration(registrations):
+    assert len(get_token_registrations('token1')) == 3
+    registrations.handler2.gossip.unregister()
+    assert len(get_token_registrations('token1')) == 2
+    gossip.get_hook('group3.subgroup.subgroup2.hook4').unregister_all()
+    assert len(get_token_registrations('token1')) == 1
+    assert not get_token_registrations('token2')
+    gossip.get_global_group().reset()
+    assert not get_token_registrations('token1')
+
+
+def test_untokened_registrations_are_not_indexed(registrations):
+    assert None not in gossip.registration._token_registrations  # pylint: disable=protected-access
+    assert not get_token_registrations(None)
+    gossip.get_group('group').unregister_token(None)
+    assert not registrations.handler1.gossip.is_active()
+    assert registrations.handler2.gossip.is_active()
+    assert len(_get_all_registrations()) == 3
+
+
+def test_unhashable_token(hook, checkpoint):
+    token = ['unhashable']
+    registration = hook.register(checkpoint, token=token)
+    assert hook.get_registrations() == [registration]
+    assert not get_token_registrations(token)
+    gossip.unregister_token(['unhashable'])
+    assert not registration.is_active()
+    hook.trigger({})
+    assert not checkpoint.called
+
+
+def test_rejected_registration_leaves_hook_unchanged(hook, checkpoint):
+    registration = hook.register(lambda: None, provides=['a'], token='token')
+    with pytest.raises(CannotResolveDependencies):
+        hook.register(checkpoint, needs=['b'], provides=['b'], token='token')
+    assert hook.get_registrations() == [registration]
+    assert get_token_registrations('token') == [registration]
+    assert not hook._unmet_deps  # pylint: disable=protected-access
+    hook.trigger({})
+    assert not checkpoint.called
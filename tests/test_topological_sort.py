@@ -1,6 +1,10 @@
+import itertools
+import random
+
 import pytest
 from gossip.exceptions import CannotResolveDependencies
-from gossip.utils import _topological_sort
+from gossip.helpers import DONT_CARE, FIRST, LAST
+from gossip.utils import _build_dependency_graph, _topological_sort, topological_sort_registrations
 
 
 def test_topological_sort(indices, graph, expected):
@@ -37,3 +41,86 @@ def expected(graph_expected):
 @pytest.fixture
 def indices():
     return list(range(5))
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_topological_sort_matches_reference(seed):
+    rand = random.Random(seed)
+    num_nodes = rand.randint(1, 30)
+    graph = set()
+    for _ in range(rand.randint(0, num_nodes * 2)):
+        n, m = rand.sample(range(num_nodes), 2) if num_nodes > 1 else (0, 0)
+        if n != m:
+            graph.add((min(n, m), max(n, m)) if rand.random() < 0.5 else (max(n, m), min(n, m)))
+    indices = list(range(num_nodes))
+    try:
+        expected = _reference_topological_sort(indices, set(graph))
+    except CannotResolveDependencies:
+        with pytest.raises(CannotResolveDependencies):
+            _topological_sort(indices, set(graph))
+    else:
+        assert _topological_sort(indices, set(graph)) == expected
+
+
+def _reference_topological_sort(indices, graph):
+    # the original quadratic implementation, kept to verify tie-breaking is unchanged
+    independent = sorted(set(indices) - set(m for n, m in graph), reverse=True)
+    returned = []
+    while independent:
+        n = independent.pop()
+        returned.append(n)
+        for m in indices:
+            edge = (n, m)
+            if edge in graph:
+                graph.remove(edge)
+                if not any(other[1] == m for other in graph):
+                    independent.append(m)
+    if graph:
+        raise CannotResolveDependencies('Cyclic dependency detected')
+    return returned
+
+
+@pytest.mark.parametrize('seed', range(20))
+@pytest.mark.parametrize('unconstrained_priority', [FIRST, LAST, DONT_CARE])
+def test_unconstrained_priority_order_matches_reference(seed, unconstrained_priority):
+    rand = random.Random(seed)
+    names = ['a', 'b', 'c', 'd', 'e', 'f']
+    registrations = []
+    for _ in range(rand.randint(1, 20)):
+        if rand.random() < 0.4:
+            registrations.append(_FakeRegistration())
+        else:
+            registrations.append(_FakeRegistration(needs=rand.sample(names[:3], rand.randint(0, 2)),
+                                                   provides=rand.sample(names[3:], rand.randint(0, 2))))
+
+    expected = _reference_sort_registrations(registrations, unconstrained_priority)
+    assert topological_sort_registrations(registrations, unconstrained_priority) == expected
+
+
+def test_unconstrained_priority_edge_count_is_linear():
+    registrations = [_FakeRegistration() for _ in range(100)] + \
+        [_FakeRegistration(provides=['x{0}'.format(i)]) for i in range(100)]
+    assert len(_build_dependency_graph(registrations, FIRST)) == len(registrations)
+
+
+class _FakeRegistration():
+
+    def __init__(self, needs=(), provides=()):
+        super().__init__()
+        self.needs = frozenset(needs)
+        self.provides = frozenset(provides)
+
+
+def _reference_sort_registrations(registrations, unconstrained_priority):
+    # the original construction, with an edge between every caring and every non-caring registration
+    graph = set(_build_dependency_graph(registrations, DONT_CARE))
+    if unconstrained_priority != DONT_CARE:
+        caring_indices = set(idx for idx, r in enumerate(registrations) if r.needs or r.provides)
+        non_caring_indices = set(range(len(registrations))) - caring_indices
+        for caring_index, uncaring_index in itertools.product(caring_indices, non_caring_indices):
+            if unconstrained_priority == FIRST:
+                graph.add((uncaring_index, caring_index))
+            else:
+                graph.add((caring_index, uncaring_index))
+    returned_indices = _reference_topological_sort(list(range(len(registrations))), graph)
+    return [registrations[idx] for idx in returned_indices]
@@ -0,0 +1,107 @@
+# pylint: disable=unused-variable, redefined-outer-name, unused-argument
+import json
+import threading
+
+import pytest
+
+import gossip
+from gossip import tracing
+
+
+@pytest.fixture
+def tracer():
+    returned = tracing.enable()
+    yield returned
+    tracing.disable()
+
+
+def _get_complete_events(tracer):
+    return [event for event in tracer.get_events() if event['ph'] == 'X']
+
+
+def _contains(outer, inner):
+    return outer['ts'] <= inner['ts'] and inner['ts'] + inner['dur'] <= outer['ts'] + outer['dur']
+
+
+def test_tracing_disabled_by_default(hook_name):
+    gossip.register(hook_name)(lambda: None)
+    assert not tracing.is_enabled()
+    assert tracing.get_tracer() is None
+    assert gossip.get_hook(hook_name)._get_dispatch_plan().recorders == ()  # pylint: disable=protected-access
+    with pytest.raises(RuntimeError):
+        tracing.export('/dev/null')
+
+
+def test_nested_triggers(tracer):
+
+    @gossip.register('tracing.outer')
+    def outer_handler():
+        gossip.trigger('tracing.inner')
+
+    @gossip.register('tracing.inner')
+    def inner_handler():
+        pass
+
+    gossip.trigger('tracing.outer')
+    events = {event['name']: event for event in _get_complete_events(tracer)}
+    assert set(events) == {'tracing.outer', 'tracing.inner',
+                           outer_handler.gossip.get_qualified_name(), inner_handler.gossip.get_qualified_name()}
+    outer_handler_event = events[outer_handler.gossip.get_qualified_name()]
+    assert outer_handler_event['cat'] == 'handler'
+    assert outer_handler_event['args'] == {'hook': 'tracing.outer'}
+    assert events['tracing.outer']['cat'] == 'trigger'
+    assert _contains(events['tracing.outer'], outer_handler_event)
+    assert _contains(outer_handler_event, events['tracing.inner'])
+    assert _contains(events['tracing.inner'], events[inner_handler.gossip.get_qualified_name()])
+    assert {event['tid'] for event in events.values()} == {threading.get_ident()}
+
+
+def test_handler_exceptions_are_traced(tracer):
+    gossip.get_or_create_group('tracing_errors').set_exception_policy(gossip.IgnoreExceptions())
+
+    @gossip.register('tracing_errors.hook')
+    def handler():
+        raise ZeroDivisionError()
+
+    gossip.trigger('tracing_errors.hook')
+    [handler_event] = [event for event in _get_complete_events(tracer) if event['cat'] == 'handler']
+    assert 'ZeroDivisionError' in handler_event['args']['exception']
+
+
+def test_ring_buffer(hook_name):
+    tracer = tracing.enable(max_events=3)
+    try:
+        gossip.register(hook_name)(lambda: None)
+        for _ in range(5):
+            gossip.trigger(hook_name)
+    finally:
+        assert tracing.disable() is tracer
+    assert len(_get_complete_events(tracer)) == 3
+    tracer.clear()
+    assert not tracer.get_events()
+
+
+def test_thread_names(hook_name, tracer):
+    gossip.register(hook_name)(lambda: None)
+    thread = threading.Thread(target=gossip.trigger, args=(hook_name,), name='tracing-thread')
+    thread.start()
+    thread.join()
+    [metadata] = [event for event in tracer.get_events() if event['ph'] == 'M']
+    assert metadata['args'] == {'name': 'tracing-thread'}
+    assert {event['tid'] for event in _get_complete_events(tracer)} == {metadata['tid']}
+
+
+def test_export(hook_name, tracer, tmpdir):
+    gossip.register(hook_name)(lambda: None)
+    gossip.trigger(hook_name)
+    path = str(tmpdir.join('trace.json'))
+    tracing.export(path)
+    with open(path, encoding='utf-8') as f:
+        trace = json.load(f)
+    assert trace['traceEvents'] == json.loads(json.dumps(tracer.get_events()))
+    assert [event['name'] for event in trace['traceEvents'] if event['ph'] == 'X'].count(hook_name) == 1
+
+
+def test_invalid_max_events():
+    with pytest.raises(ValueError):
+        tracing.enable(max_events=0)
@@ -0,0 +1,135 @@
+# pylint: disable=unused-variable
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import gossip
+
+
+def test_trigger_many_calls_handlers_per_event(hook_name):
+    called = []
+
+    @gossip.register(hook_name)
+    def handler_1(x):
+        called.append((1, x))
+
+    @gossip.register(hook_name)
+    def handler_2(x):
+        called.append((2, x))
+
+    gossip.trigger_many(hook_name, ({'x': x} for x in range(3)))
+    assert called == [(1, 0), (2, 0), (1, 1), (2, 1), (1, 2), (2, 2)]
+
+
+def test_trigger_many_nonexistent_hook():
+    gossip.trigger_many('nonexistent_hook', [{'x': 1}])
+
+
+def test_batch_handlers(hook_name):
+    called = []
+
+    @gossip.register(hook_name, batch=True)
+    def batch_handler(events):
+        called.append(('batch', [event['x'] for event in events]))
+
+    @gossip.register(hook_name)
+    def handler(x):
+        called.append(('event', x))
+
+    gossip.trigger_many(hook_name, [{'x': 1}, {'x': 2}])
+    assert called == [('event', 1), ('event', 2), ('batch', [1, 2])]
+
+    del called[:]
+    gossip.trigger(hook_name, x=3)
+    assert called == [('event', 3), ('batch', [3])]
+
+
+@pytest.mark.parametrize('dependencies', [{'needs': ['x']}, {'provides': ['x']}])
+def test_batch_handlers_cannot_have_dependencies(hook_name, dependencies):
+    with pytest.raises(AssertionError):
+        gossip.register(hook_name, batch=True, **dependencies)(lambda events: None)
+    assert not gossip.get_hook(hook_name).get_registrations()
+
+
+def test_batch_handlers_not_called_for_empty_batch(hook_name):
+    called = []
+
+    @gossip.register(hook_name, batch=True)
+    def batch_handler(events):
+        called.append(events)
+
+    gossip.trigger_many(hook_name, [])
+    assert not called
+
+
+def test_batch_handlers_async(hook_name):
+    called = []
+
+    @gossip.register(hook_name, batch=True)
+    async def batch_handler(events):
+        called.append(events)
+
+    asyncio.run(gossip.trigger_async(hook_name, x=1))
+    assert called == [[{'x': 1}]]
+
+
+def test_trigger_many_muted(hook_name, checkpoint):
+    gossip.register(hook_name)(checkpoint)
+    with gossip.mute_context([hook_name]):
+        gossip.trigger_many(hook_name, [{}, {}])
+    assert not checkpoint.called
+
+
+def test_trigger_many_defers_exceptions_to_end_of_batch():
+    called = []
+    gossip.get_or_create_group('defer_group').set_exception_policy(gossip.RaiseDefer())
+
+    @gossip.register('defer_group.hook')
+    def handler(x):
+        called.append(x)
+        raise ValueError(x)
+
+    with pytest.raises(ValueError) as caught:
+        gossip.trigger_many('defer_group.hook', [{'x': 1}, {'x': 2}])
+    assert called == [1, 2]
+    assert caught.value.args == (1,)
+
+
+def test_trigger_many_validates_each_event():
+    hook = gossip.define('strict_group.hook', arg_names={'x': int})
+    gossip.get_group('strict_group').set_strict()
+    called = []
+
+    def batch_handler(events):
+        called.append(events)
+
+    hook.register(batch_handler, batch=True)
+
+    with pytest.raises(TypeError):
+        hook.trigger_many([{'x': 1}, {'x': 'a'}])
+    assert not called
+
+
+def test_trigger_many_with_tags(hook_name):
+    called = []
+    hook = gossip.define(hook_name)
+    hook.register(lambda x: called.append(('a', x)), tags=('a',))
+    hook.register(lambda x: called.append(('b', x)), tags=('b',))
+
+    hook.trigger_many([{'x': 1}, {'x': 2}], tags=('b',))
+    assert called == [('b', 1), ('b', 2)]
+
+
+def test_trigger_many_with_executor():
+    called = []
+    with ThreadPoolExecutor(2) as executor:
+        gossip.get_or_create_group('trigger_many_group').set_executor(executor)
+        for index in range(2):
+            gossip.register('trigger_many_group.hook')(lambda x, index=index: called.append((index, x)))
+        gossip.register('trigger_many_group.hook', batch=True)(lambda events: called.append(('batch', len(events))))
+
+        gossip.trigger_many('trigger_many_group.hook', [{'x': 1}, {'x': 2}])
+    assert sorted(called[:2]) == [(0, 1), (1, 1)]
+    assert sorted(called[2:4]) == [(0, 2), (1, 2)]
+    assert called[4:] == [('batch', 2)]